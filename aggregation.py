@@ -0,0 +1,245 @@
+"""Инкрементальные итоги тренировок по спортсменам.
+
+`AthleteAggregator` принимает результаты `InfoMessage` и поддерживает
+накопленные суммы по спортсмену и виду тренировки в окнах двух типов:
+
+* неперекрывающиеся (tumbling) — календарные день, неделя, месяц;
+* скользящие (sliding) — например, последние 7 суток.
+
+Обновление и запрос стоят O(1) (для скользящих окон — амортизированно),
+независимо от длины истории. Время задаётся в секундах Unix-эпохи (UTC).
+"""
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, Hashable, Iterable, Optional, Tuple
+
+from homework import InfoMessage
+
+SECONDS_IN_DAY: int = 24 * 60 * 60
+SECONDS_IN_WEEK: int = 7 * SECONDS_IN_DAY
+# 1 января 1970 года — четверг; сдвиг делает началом недели понедельник.
+_EPOCH_WEEKDAY_SHIFT: int = 3
+
+
+def day_bucket(timestamp: float) -> int:
+    return int(timestamp // SECONDS_IN_DAY)
+
+
+def week_bucket(timestamp: float) -> int:
+    return (day_bucket(timestamp) + _EPOCH_WEEKDAY_SHIFT) // 7
+
+
+def month_bucket(timestamp: float) -> Tuple[int, int]:
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return moment.year, moment.month
+
+
+PERIODS: Dict[str, Callable[[float], Hashable]] = {
+    'day': day_bucket,
+    'week': week_bucket,
+    'month': month_bucket,
+}
+
+
+@dataclass
+class Totals:
+    """Накопленные итоги по набору тренировок."""
+
+    count: int = 0
+    duration: float = 0.0
+    distance: float = 0.0
+    calories: float = 0.0
+    speed_sum: float = 0.0
+    max_speed: float = 0.0
+
+    def add(self, message: InfoMessage) -> None:
+        self.count += 1
+        self.duration += message.duration
+        self.distance += message.distance
+        self.calories += message.calories
+        self.speed_sum += message.speed
+        if message.speed > self.max_speed:
+            self.max_speed = message.speed
+
+    def merge(self, other: 'Totals') -> None:
+        self.count += other.count
+        self.duration += other.duration
+        self.distance += other.distance
+        self.calories += other.calories
+        self.speed_sum += other.speed_sum
+        self.max_speed = max(self.max_speed, other.max_speed)
+
+    def subtract(self, other: 'Totals') -> None:
+        """Вычесть итоги (кроме максимума, его ведёт окно)."""
+        self.count -= other.count
+        self.duration -= other.duration
+        self.distance -= other.distance
+        self.calories -= other.calories
+        self.speed_sum -= other.speed_sum
+
+    @property
+    def mean_speed(self) -> float:
+        return self.speed_sum / self.count if self.count else 0.0
+
+    @property
+    def mean_calories(self) -> float:
+        return self.calories / self.count if self.count else 0.0
+
+
+class TumblingWindow:
+    """Итоги по календарным периодам с ограниченной глубиной хранения.
+
+    Хранятся `retention` самых новых периодов. Запоздавшая тренировка
+    попадает в свой период, если он ещё хранится; тренировки старше
+    самого старого хранимого периода не учитываются (`dropped`).
+    """
+
+    def __init__(self, period: str, retention: int = 400) -> None:
+        self.bucket = PERIODS[period]
+        self.retention = retention
+        self.dropped = 0
+        # Периоды упорядочены по возрастанию ключа.
+        self._buckets: 'OrderedDict[Hashable, Totals]' = OrderedDict()
+
+    def add(self, timestamp: float, message: InfoMessage) -> None:
+        key = self.bucket(timestamp)
+        totals = self._buckets.get(key)
+        if totals is None:
+            totals = self._new_bucket(key)
+            if totals is None:
+                self.dropped += 1
+                return
+        totals.add(message)
+
+    def _new_bucket(self, key: Hashable) -> Optional[Totals]:
+        """Завести период `key`; `None`, если он старше хранимых."""
+        buckets = self._buckets
+        late = bool(buckets) and key < next(reversed(buckets))
+        if late and len(buckets) >= self.retention and (
+                key < next(iter(buckets))):
+            return None
+        totals = buckets[key] = Totals()
+        if late:
+            # Пропущенный период внутри хранимого диапазона — редкость,
+            # порядок восстанавливаем сортировкой.
+            self._buckets = buckets = OrderedDict(sorted(buckets.items()))
+        if len(buckets) > self.retention:
+            buckets.popitem(last=False)
+        return totals
+
+    def get(self, timestamp: float) -> Totals:
+        """Итоги за период, в который попадает `timestamp`."""
+        return self._buckets.get(self.bucket(timestamp), Totals())
+
+
+class SlidingWindow:
+    """Итоги за последние `length` секунд.
+
+    Данные хранятся частями по `resolution` секунд: при сдвиге окна
+    устаревшие части вычитаются из общей суммы, а максимум скорости
+    поддерживается монотонной очередью. Окно сдвигается с точностью до
+    `resolution`. Тренировки старше последней части учитываются в ней.
+    """
+
+    def __init__(self, length: float, resolution: float = 3600) -> None:
+        if length < resolution:
+            raise ValueError('length must not be less than resolution')
+        self.length = length
+        self.resolution = resolution
+        self._totals = Totals()
+        self._parts: Deque[Tuple[float, Totals]] = deque()
+        self._maxima: Deque[Tuple[float, float]] = deque()
+
+    def add(self, timestamp: float, message: InfoMessage) -> None:
+        start = timestamp - timestamp % self.resolution
+        if not self._parts or self._parts[-1][0] < start:
+            self._parts.append((start, Totals()))
+        self._parts[-1][1].add(message)
+        self._totals.add(message)
+        start = self._parts[-1][0]
+        while self._maxima and self._maxima[-1][1] <= message.speed:
+            self._maxima.pop()
+        self._maxima.append((start, message.speed))
+        self._expire(timestamp)
+
+    def get(self, now: float) -> Totals:
+        """Итоги за окно, заканчивающееся в момент `now`."""
+        self._expire(now)
+        totals = Totals()
+        totals.merge(self._totals)
+        totals.max_speed = self._maxima[0][1] if self._maxima else 0.0
+        return totals
+
+    def _expire(self, now: float) -> None:
+        horizon = now - self.length
+        while self._parts and self._parts[0][0] + self.resolution <= horizon:
+            self._totals.subtract(self._parts.popleft()[1])
+        while self._maxima and self._maxima[0][0] + self.resolution <= horizon:
+            self._maxima.popleft()
+        if not self._parts:
+            self._totals = Totals()
+
+
+class AthleteAggregator:
+    """Итоги тренировок по спортсменам и видам тренировок."""
+
+    def __init__(self, periods: Iterable[str] = ('day', 'week', 'month'),
+                 sliding: Iterable[float] = (SECONDS_IN_WEEK,),
+                 resolution: float = 3600, retention: int = 400) -> None:
+        self.periods = tuple(periods)
+        self.sliding = tuple(sliding)
+        self.resolution = resolution
+        self.retention = retention
+        self._tumbling: Dict[Tuple[Hashable, str, str], TumblingWindow] = {}
+        self._sliding: Dict[Tuple[Hashable, str, float], SlidingWindow] = {}
+        self._types: Dict[Hashable, set] = {}
+
+    def add(self, athlete: Hashable, timestamp: float,
+            message: InfoMessage) -> None:
+        """Учесть результат тренировки спортсмена."""
+        training_type = message.training_type
+        self._types.setdefault(athlete, set()).add(training_type)
+        for period in self.periods:
+            key = (athlete, training_type, period)
+            window = self._tumbling.get(key)
+            if window is None:
+                window = self._tumbling[key] = TumblingWindow(
+                    period, self.retention)
+            window.add(timestamp, message)
+        for length in self.sliding:
+            key = (athlete, training_type, length)
+            window = self._sliding.get(key)
+            if window is None:
+                window = self._sliding[key] = SlidingWindow(
+                    length, self.resolution)
+            window.add(timestamp, message)
+
+    def period(self, athlete: Hashable, period: str, timestamp: float,
+               training_type: Optional[str] = None) -> Totals:
+        """Итоги за календарный период, содержащий `timestamp`.
+
+        Без `training_type` итоги суммируются по всем видам тренировок.
+        """
+        totals = Totals()
+        for kind in self._kinds(athlete, training_type):
+            window = self._tumbling.get((athlete, kind, period))
+            if window is not None:
+                totals.merge(window.get(timestamp))
+        return totals
+
+    def recent(self, athlete: Hashable, length: float, now: float,
+               training_type: Optional[str] = None) -> Totals:
+        """Итоги за скользящее окно длиной `length`, оканчивающееся в `now`."""
+        totals = Totals()
+        for kind in self._kinds(athlete, training_type):
+            window = self._sliding.get((athlete, kind, length))
+            if window is not None:
+                totals.merge(window.get(now))
+        return totals
+
+    def _kinds(self, athlete: Hashable,
+               training_type: Optional[str]) -> Iterable[str]:
+        if training_type is not None:
+            return (training_type,)
+        return self._types.get(athlete, ())
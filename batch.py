@@ -0,0 +1,177 @@
+"""Векторизованный (столбцовый) расчёт показателей тренировок.
+
+Вместо создания объекта `Training` на каждый пакет данные группируются
+по коду тренировки и обрабатываются целиком массивами NumPy.
+Калории считаются теми же функциями, что и в классах из `homework.py`
+(`calorie_kernel`), а порядок остальных операций повторяет методы
+классов, поэтому результаты совпадают с поэлементным расчётом.
+Нулевая длительность или рост, как и в классах, дают `ZeroDivisionError`,
+а не `inf`/`nan` в результатах.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import constants
+from homework import WORKOUT_TYPES, InfoMessage, calorie_kernel
+
+Columns = Dict[str, np.ndarray]
+
+
+@dataclass
+class BatchResult:
+    """Результаты расчёта пачки тренировок одного вида."""
+
+    training_type: str
+    duration: np.ndarray
+    distance: np.ndarray
+    speed: np.ndarray
+    calories: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.duration)
+
+    def to_messages(self) -> List[InfoMessage]:
+        """Вернуть результаты в виде списка `InfoMessage`."""
+        return [
+            InfoMessage(self.training_type, duration, distance,
+                        speed, calories)
+            for duration, distance, speed, calories in zip(
+                self.duration.tolist(), self.distance.tolist(),
+                self.speed.tolist(), self.calories.tolist())
+        ]
+
+
+def _distance(action: np.ndarray, len_step: float) -> np.ndarray:
+    return action * len_step / constants.M_IN_KM
+
+
+def _divisor(column: np.ndarray, name: str) -> np.ndarray:
+    """Проверить, что в столбце делителя нет нулей."""
+    if not column.all():
+        raise ZeroDivisionError('{} must not be zero'.format(name))
+    return column
+
+
+def running_batch(action, duration, weight,
+                  profile: Optional[str] = None) -> BatchResult:
+    """Рассчитать пачку тренировок: бег."""
+    action, duration, weight = _as_float(action, duration, weight)
+    distance = _distance(action, constants.LEN_STEP)
+    speed = distance / _divisor(duration, 'duration')
+    calories = calorie_kernel(WORKOUT_TYPES['RUN'], profile)(
+        speed, duration, weight)
+    return BatchResult('Running', duration, distance, speed, calories)
+
+
+def walking_batch(action, duration, weight, height,
+                  profile: Optional[str] = None) -> BatchResult:
+    """Рассчитать пачку тренировок: спортивная ходьба."""
+    action, duration, weight, height = _as_float(
+        action, duration, weight, height)
+    _divisor(height, 'height')
+    distance = _distance(action, constants.LEN_STEP)
+    speed = distance / _divisor(duration, 'duration')
+    calories = calorie_kernel(WORKOUT_TYPES['WLK'], profile)(
+        speed, duration, weight, height)
+    return BatchResult('SportsWalking', duration, distance, speed, calories)
+
+
+def swimming_batch(action, duration, weight, length_pool, count_pool,
+                   profile: Optional[str] = None) -> BatchResult:
+    """Рассчитать пачку тренировок: плавание."""
+    action, duration, weight, length_pool, count_pool = _as_float(
+        action, duration, weight, length_pool, count_pool)
+    distance = _distance(action, constants.LEN_PADDLE)
+    speed = (length_pool * count_pool / constants.M_IN_KM
+             / _divisor(duration, 'duration'))
+    calories = calorie_kernel(WORKOUT_TYPES['SWM'], profile)(
+        speed, duration, weight)
+    return BatchResult('Swimming', duration, distance, speed, calories)
+
+
+BATCH_KERNELS: Dict[str, Callable[..., BatchResult]] = {
+    'RUN': running_batch,
+    'WLK': walking_batch,
+    'SWM': swimming_batch,
+}
+
+
+# Поля пакета для каждого кода, в порядке аргументов конструктора.
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    code: WORKOUT_TYPES[code].PACKAGE_FIELDS for code in BATCH_KERNELS
+}
+
+
+def _as_float(*columns) -> Tuple[np.ndarray, ...]:
+    return tuple(np.asarray(column, dtype=np.float64) for column in columns)
+
+
+def compute_batch(workout_type: str, columns: Columns,
+                  profile: Optional[str] = None) -> BatchResult:
+    """Рассчитать показатели для столбцов данных одного вида тренировки.
+
+    `profile` — профиль коэффициентов калорий, по умолчанию выбранный
+    для класса тренировки.
+    """
+    if workout_type not in BATCH_KERNELS:
+        raise KeyError(
+            'Invalid training type. '
+            'Available types: {}'.format(', '.join(BATCH_KERNELS))
+        )
+    return BATCH_KERNELS[workout_type](
+        *(columns[name] for name in COLUMNS[workout_type]), profile=profile)
+
+
+def packages_to_columns(
+    packages: Iterable[Tuple[str, Sequence[float]]]
+) -> Tuple[Dict[str, Columns], Dict[str, np.ndarray]]:
+    """Сгруппировать пакеты по коду тренировки и разложить на столбцы.
+
+    Возвращает столбцы для каждого кода и индексы пакетов во входной
+    последовательности, чтобы восстановить исходный порядок.
+    """
+    rows: Dict[str, List[Sequence[float]]] = {}
+    positions: Dict[str, List[int]] = {}
+    for position, (workout_type, data) in enumerate(packages):
+        if workout_type not in COLUMNS:
+            raise KeyError(
+                'Invalid training type. '
+                'Available types: {}'.format(', '.join(COLUMNS))
+            )
+        rows.setdefault(workout_type, []).append(data)
+        positions.setdefault(workout_type, []).append(position)
+
+    grouped: Dict[str, Columns] = {}
+    for workout_type, data in rows.items():
+        names = COLUMNS[workout_type]
+        matrix = np.asarray(data, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != len(names):
+            raise TypeError(
+                '{} expects {} values per package'.format(
+                    workout_type, len(names))
+            )
+        grouped[workout_type] = {
+            name: matrix[:, index] for index, name in enumerate(names)
+        }
+    return grouped, {
+        workout_type: np.asarray(index, dtype=np.intp)
+        for workout_type, index in positions.items()
+    }
+
+
+def read_packages_batch(
+    packages: Iterable[Tuple[str, Sequence[float]]],
+    profile: Optional[str] = None,
+) -> List[InfoMessage]:
+    """Рассчитать пакеты пачкой и вернуть сообщения в исходном порядке."""
+    grouped, positions = packages_to_columns(packages)
+    total = sum(len(index) for index in positions.values())
+    messages: List[InfoMessage] = [None] * total
+    for workout_type, columns in grouped.items():
+        result = compute_batch(workout_type, columns, profile)
+        for position, message in zip(positions[workout_type].tolist(),
+                                     result.to_messages()):
+            messages[position] = message
+    return messages
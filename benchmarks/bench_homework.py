@@ -0,0 +1,182 @@
+"""Замеры производительности расчёта тренировок.
+
+Для каждого вида тренировки замеряются `get_distance`,
+`get_mean_speed` и `get_spent_calories`, а также выбор класса в
+`read_package` и `InfoMessage.get_message`. Наборы данных генерируются
+кусками, поэтому даже 1e7 пакетов не держатся в памяти целиком.
+
+Запуск из корня проекта:
+
+    python -m benchmarks.bench_homework --sizes 1e3 1e5 1e7 -o bench.json
+
+Сравнение двух прогонов — `benchmarks.compare`.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections import deque
+from itertools import starmap
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence
+
+from benchmarks.datasets import iter_chunks
+from homework import read_package
+from stats import percentiles
+
+CHUNK_SIZE: int = 10_000
+LATENCY_SAMPLES: int = 200
+DEFAULT_SIZES: Sequence[int] = (1_000, 10_000, 100_000)
+
+
+class Case(NamedTuple):
+    """Сценарий замера."""
+
+    name: str
+    workout_types: Sequence[str]
+    prepare: Callable[[list], list]
+    call: Callable
+    run: Callable[[list], None]
+
+
+def _consume(iterable: Iterable) -> None:
+    deque(iterable, maxlen=0)
+
+
+def _trainings(packages: list) -> list:
+    return list(starmap(read_package, packages))
+
+
+def _messages(packages: list) -> list:
+    return [training.show_training_info()
+            for training in _trainings(packages)]
+
+
+def _method_case(workout_type: str, class_name: str, method: str) -> Case:
+    def call(training):
+        return getattr(training, method)()
+
+    def run(trainings):
+        _consume(map(getattr(type(trainings[0]), method), trainings))
+
+    return Case('{}.{}'.format(class_name, method), (workout_type,),
+                _trainings, call, run)
+
+
+def build_cases() -> List[Case]:
+    """Собрать все сценарии замеров."""
+    cases = [
+        _method_case(workout_type, class_name, method)
+        for workout_type, class_name in (('RUN', 'Running'),
+                                         ('WLK', 'SportsWalking'),
+                                         ('SWM', 'Swimming'))
+        for method in ('get_distance', 'get_mean_speed',
+                       'get_spent_calories')
+    ]
+    cases.append(Case(
+        'read_package', ('RUN', 'WLK', 'SWM'), list,
+        lambda package: read_package(*package),
+        lambda packages: _consume(starmap(read_package, packages)),
+    ))
+    cases.append(Case(
+        'InfoMessage.get_message', ('RUN', 'WLK', 'SWM'), _messages,
+        lambda message: message.get_message(),
+        lambda messages: _consume(
+            message.get_message() for message in messages),
+    ))
+    return cases
+
+
+def _timer_overhead_ns() -> int:
+    clock = time.perf_counter_ns
+    return min(-clock() + clock() for _ in range(1000))
+
+
+def _sample_latencies(case: Case, chunk: list, limit: int,
+                      overhead: int) -> List[int]:
+    """Задержки отдельных вызовов на свежеподготовленных данных.
+
+    Объекты после `case.run` уже хранят рассчитанные показатели, поэтому
+    выборка готовится заново, иначе замерялись бы попадания в кэш.
+    """
+    clock = time.perf_counter_ns
+    samples = []
+    for item in case.prepare(chunk[:limit]):
+        started = clock()
+        case.call(item)
+        samples.append(max(clock() - started - overhead, 0))
+    return samples
+
+
+def _peak_memory(case: Case, size: int, seed: int) -> int:
+    chunk = next(iter_chunks(size, min(size, CHUNK_SIZE), seed,
+                             case.workout_types))
+    tracemalloc.start()
+    try:
+        case.run(case.prepare(chunk))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(case: Case, size: int, seed: int = 0) -> Dict[str, object]:
+    """Замерить сценарий на наборе из `size` пакетов."""
+    overhead = _timer_overhead_ns()
+    elapsed = 0.0
+    latencies: List[int] = []
+    for chunk in iter_chunks(size, CHUNK_SIZE, seed, case.workout_types):
+        items = case.prepare(chunk)
+        started = time.perf_counter()
+        case.run(items)
+        elapsed += time.perf_counter() - started
+        latencies.extend(_sample_latencies(
+            case, chunk, LATENCY_SAMPLES, overhead))
+    return {
+        'case': case.name,
+        'size': size,
+        'seconds': elapsed,
+        'ops_per_second': size / elapsed if elapsed else 0.0,
+        'latency_ns': percentiles(latencies),
+        'peak_memory_bytes': _peak_memory(case, size, seed),
+    }
+
+
+def run(sizes: Sequence[int], cases: Sequence[Case],
+        seed: int = 0) -> Dict[str, object]:
+    """Выполнить все замеры и вернуть отчёт."""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': [measure(case, size, seed)
+                    for size in sizes for case in cases],
+    }
+
+
+def main(argv: Sequence[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', type=float,
+                        default=DEFAULT_SIZES,
+                        help='размеры наборов данных, например 1e3 1e7')
+    parser.add_argument('--case', action='append',
+                        help='запустить только указанные сценарии')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='файл для отчёта в JSON')
+    args = parser.parse_args(argv)
+    cases = [case for case in build_cases()
+             if not args.case or case.name in args.case]
+    report = run([int(size) for size in args.sizes], cases, args.seed)
+    for result in report['results']:
+        print('{case:<35} {size:>10} {ops_per_second:>14,.0f} op/s  '
+              'p50 {p50:>6} ns  p99 {p99:>6} ns'.format(
+                  p50=result['latency_ns']['p50'],
+                  p99=result['latency_ns']['p99'], **result))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
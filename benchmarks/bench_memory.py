@@ -0,0 +1,79 @@
+"""Сравнение расхода памяти на одну тренировку.
+
+Запуск из корня проекта: `python -m benchmarks.bench_memory [количество]`.
+
+`Baseline` — прежнее устройство классов: данные в `__dict__` экземпляра
+и неиспользуемый атрибут `calories`. С ним сравниваются нынешние классы
+со слотами и `TrainingStore`.
+"""
+import sys
+import tracemalloc
+
+from benchmarks.datasets import make_packages
+from homework import read_package
+from store import TrainingStore
+
+
+class BaselineTraining:
+    """Тренировка с данными в `__dict__`, как до перехода на слоты."""
+
+    def __init__(self, action: int, duration: float, weight: float) -> None:
+        self.calories = None
+        self.action = action
+        self.duration = duration
+        self.weight = weight
+
+
+class BaselineSportsWalking(BaselineTraining):
+
+    def __init__(self, action: int, duration: float, weight: float,
+                 height: float) -> None:
+        super().__init__(action, duration, weight)
+        self.height = height
+
+
+class BaselineSwimming(BaselineTraining):
+
+    def __init__(self, action: int, duration: float, weight: float,
+                 length_pool: float, count_pool: int) -> None:
+        super().__init__(action, duration, weight)
+        self.length_pool = length_pool
+        self.count_pool = count_pool
+
+
+BASELINE_TYPES = {
+    'SWM': BaselineSwimming,
+    'RUN': BaselineTraining,
+    'WLK': BaselineSportsWalking,
+}
+
+
+def measure(build, packages) -> float:
+    """Вернуть число байт на одну тренировку."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build(packages)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'lineno'))
+    del kept
+    return size / len(packages)
+
+
+def main(count: int = 100_000) -> None:
+    packages = make_packages(count)
+    baseline = measure(
+        lambda items: [BASELINE_TYPES[workout_type](*data)
+                       for workout_type, data in items],
+        packages)
+    objects = measure(
+        lambda items: [read_package(*package) for package in items],
+        packages)
+    store = measure(TrainingStore, packages)
+    print(f'Baseline (__dict__): {baseline:.1f} bytes per session')
+    print(f'Training (__slots__): {objects:.1f} bytes per session')
+    print(f'TrainingStore:        {store:.1f} bytes per session')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,106 @@
+"""Замер времени запуска CLI `homework.py`.
+
+Время импорта модуля берётся из `python -X importtime`, время запуска
+целиком — по часам для процесса `python homework.py` на небольшом файле.
+Отчёт совместим с `benchmarks.compare` (`ops_per_second` — запусков в
+секунду), поэтому регрессии запуска ловятся той же проверкой:
+
+    python -m benchmarks.bench_startup -o startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from stats import percentiles
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLE = 'SWM 720 1 80 25 40\nRUN 15000 1 75\nWLK 9000 1 75 180\n'
+
+
+def _environment() -> Dict[str, str]:
+    # Без записи байт-кода каждый запуск заново компилирует модули,
+    # и замер показывал бы время компиляции, а не импорта.
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return env
+
+
+def import_times(runs: int, module: str = 'homework') -> List[float]:
+    """Суммарное время импорта модуля в секундах по `-X importtime`."""
+    env = _environment()
+    samples = []
+    for _ in range(runs + 1):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            fields = [field.strip() for field in line.split('|')]
+            if len(fields) == 3 and fields[2] == module:
+                samples.append(int(fields[1]) / 1_000_000)
+    # Первый запуск прогревает кэш байт-кода.
+    return samples[1:]
+
+
+def process_times(command: Sequence[str], runs: int) -> List[float]:
+    """Время работы процесса целиком в секундах."""
+    env = _environment()
+    samples = []
+    for _ in range(runs + 1):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - started)
+    return samples[1:]
+
+
+def _result(case: str, samples: List[float]) -> Dict[str, object]:
+    best = min(samples)
+    return {
+        'case': case,
+        'size': len(samples),
+        'seconds': best,
+        'ops_per_second': 1 / best if best else 0.0,
+        'latency_ns': {name: int(value * 1e9)
+                       for name, value in percentiles(samples).items()},
+    }
+
+
+def run(runs: int = 20) -> Dict[str, object]:
+    with tempfile.NamedTemporaryFile('w', suffix='.txt',
+                                     delete=False) as sample:
+        sample.write(SAMPLE)
+    try:
+        results = [
+            _result('import homework', import_times(runs)),
+            _result('python -c pass',
+                    process_times([sys.executable, '-c', 'pass'], runs)),
+            _result('homework.py FILE', process_times(
+                [sys.executable, 'homework.py', sample.name], runs)),
+        ]
+    finally:
+        os.unlink(sample.name)
+    return {'python': sys.version.split()[0], 'results': results}
+
+
+def main(argv: Sequence[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('-o', '--output', help='файл для отчёта в JSON')
+    args = parser.parse_args(argv)
+    report = run(args.runs)
+    for result in report['results']:
+        print('{case:<20} {ms:8.2f} ms'.format(
+            ms=result['seconds'] * 1000, **result))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Сравнение двух отчётов `bench_homework` для проверки регрессий.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 10
+
+Завершается с кодом 1, если пропускная способность какого-либо
+сценария упала больше чем на `threshold` процентов.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Sequence, Tuple
+
+Key = Tuple[str, int]
+
+
+def load(path: str) -> Dict[Key, dict]:
+    with open(path) as report:
+        results = json.load(report)['results']
+    return {(result['case'], result['size']): result for result in results}
+
+
+def compare(baseline: Dict[Key, dict], current: Dict[Key, dict],
+            threshold: float) -> List[str]:
+    """Вернуть описания сценариев, замедлившихся сильнее порога."""
+    regressions = []
+    for key in sorted(baseline.keys() & current.keys()):
+        before = baseline[key]['ops_per_second']
+        after = current[key]['ops_per_second']
+        if not before:
+            continue
+        change = (after - before) / before * 100
+        if change < -threshold:
+            regressions.append('{} [{}]: {:,.0f} -> {:,.0f} op/s '
+                               '({:+.1f}%)'.format(*key, before, after,
+                                                   change))
+    return regressions
+
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='допустимое падение в процентах')
+    args = parser.parse_args(argv)
+    regressions = compare(load(args.baseline), load(args.current),
+                          args.threshold)
+    for line in regressions:
+        print(line)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
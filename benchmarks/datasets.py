@@ -0,0 +1,38 @@
+"""Синтетические наборы пакетов для замеров производительности."""
+import random
+from typing import Iterator, List, Sequence, Tuple
+
+Package = Tuple[str, List[float]]
+
+WORKOUT_TYPES: Sequence[str] = ('RUN', 'WLK', 'SWM')
+
+
+def make_package(rnd: random.Random, workout_type: str) -> Package:
+    """Сгенерировать правдоподобный пакет заданного вида."""
+    data = [rnd.randint(1, 20000), rnd.uniform(0.1, 5), rnd.uniform(40, 120)]
+    if workout_type == 'WLK':
+        data.append(rnd.randint(120, 210))
+    elif workout_type == 'SWM':
+        data.extend([rnd.randint(10, 50), rnd.randint(1, 80)])
+    return workout_type, data
+
+
+def make_packages(count: int, seed: int = 0,
+                  workout_types: Sequence[str] = WORKOUT_TYPES
+                  ) -> List[Package]:
+    """Сгенерировать список из `count` пакетов."""
+    rnd = random.Random(seed)
+    return [make_package(rnd, rnd.choice(workout_types))
+            for _ in range(count)]
+
+
+def iter_chunks(count: int, chunk_size: int, seed: int = 0,
+                workout_types: Sequence[str] = WORKOUT_TYPES
+                ) -> Iterator[List[Package]]:
+    """Генерировать набор кусками, не держа его целиком в памяти."""
+    rnd = random.Random(seed)
+    while count > 0:
+        size = min(chunk_size, count)
+        yield [make_package(rnd, rnd.choice(workout_types))
+               for _ in range(size)]
+        count -= size
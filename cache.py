@@ -0,0 +1,116 @@
+"""Кэш результатов для повторяющихся пакетов.
+
+Повторные отправки с устройств приводят к одинаковым пакетам. `PacketCache`
+хранит рассчитанные `InfoMessage` по ключу `(код, профиль калорий,
+значения пакета)` с вытеснением давно не использованных записей (LRU)
+и необязательным временем жизни (TTL). Кэш можно использовать из
+нескольких потоков.
+"""
+import copy
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Callable, Hashable, Optional, Sequence, Tuple
+
+from homework import WORKOUT_TYPES, InfoMessage, read_package
+
+Key = Tuple[str, Optional[str], Tuple[Hashable, ...]]
+
+DEFAULT_MAXSIZE: int = 65_536
+
+
+@dataclass
+class CacheStats:
+    """Статистика работы кэша."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def compute_info(workout_type: str, data: Sequence[float]) -> InfoMessage:
+    """Рассчитать сообщение для пакета без кэша."""
+    return read_package(workout_type, data).show_training_info()
+
+
+class PacketCache:
+    """Ограниченный кэш `InfoMessage` по содержимому пакета.
+
+    Каждый вызов получает собственную копию сообщения, поэтому изменение
+    результата вызывающей стороной не влияет на кэш. Ошибки расчёта не
+    кэшируются.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE,
+                 ttl: Optional[float] = None,
+                 compute: Callable[[str, Sequence[float]],
+                                   InfoMessage] = compute_info,
+                 clock: Callable[[], float] = monotonic) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be positive')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._compute = compute
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Key, Tuple[float, InfoMessage]]' = (
+            OrderedDict())
+        self._stats = CacheStats()
+
+    @staticmethod
+    def key(workout_type: str, data: Sequence[float]) -> Key:
+        """Нормализованный ключ пакета.
+
+        В ключ входит выбранный профиль коэффициентов калорий, чтобы после
+        `use_profile` не отдавать калории, рассчитанные по старому профилю.
+        """
+        workout = WORKOUT_TYPES.get(workout_type)
+        profile = None if workout is None else workout.calorie_profile
+        return workout_type, profile, tuple(data)
+
+    def get_info(self, workout_type: str,
+                 data: Sequence[float]) -> InfoMessage:
+        """Вернуть сообщение для пакета, рассчитав его при промахе."""
+        key = self.key(workout_type, data)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored, message = entry
+                if self.ttl is None or now - stored < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return copy.copy(message)
+                del self._entries[key]
+                self._stats.expirations += 1
+            self._stats.misses += 1
+        message = self._compute(workout_type, data)
+        with self._lock:
+            self._entries[key] = (now, message)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+        return copy.copy(message)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> CacheStats:
+        """Снимок статистики."""
+        with self._lock:
+            return CacheStats(self._stats.hits, self._stats.misses,
+                              self._stats.evictions, self._stats.expirations,
+                              len(self._entries))
@@ -0,0 +1,187 @@
+"""Выгрузка результатов тренировок для аналитики.
+
+Вместо разбора строк `INFO_MESSAGE` (с округлением до трёх знаков)
+результаты пишутся столбцами с полной точностью:
+
+* `CsvExporter` — CSV, строки дописываются кусками;
+* `NpzExporter` — файл `.npz`: по массиву на каждое поле, вид тренировки
+  хранится кодами `training_type` и справочником `training_type_names`.
+
+Оба принимают `InfoMessage` или целые `batch.BatchResult` и не создают
+словарей на каждую строку. `NpzExporter` копит данные во временных
+файлах, поэтому объём выгрузки не ограничен оперативной памятью.
+"""
+import csv
+import os
+import shutil
+import tempfile
+import zipfile
+from array import array
+from typing import Dict, Iterable, List, TextIO, Tuple
+
+import numpy as np
+
+from batch import BatchResult
+from homework import InfoMessage
+
+FIELDS: Tuple[str, ...] = (
+    'training_type', 'duration', 'distance', 'speed', 'calories')
+NUMERIC_FIELDS: Tuple[str, ...] = FIELDS[1:]
+DEFAULT_CHUNK_SIZE: int = 65_536
+
+
+class CsvExporter:
+    """Запись результатов в CSV кусками по `chunk_size` строк."""
+
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 append: bool = False) -> None:
+        exists = append and os.path.exists(path) and os.path.getsize(path)
+        self._file: TextIO = open(path, 'a' if append else 'w', newline='')
+        self._writer = csv.writer(self._file)
+        if not exists:
+            self._writer.writerow(FIELDS)
+        self.chunk_size = chunk_size
+        self._rows: List[tuple] = []
+        self.count = 0
+
+    def write(self, messages: Iterable[InfoMessage]) -> None:
+        """Добавить сообщения."""
+        rows = self._rows
+        for message in messages:
+            rows.append((message.training_type, message.duration,
+                         message.distance, message.speed, message.calories))
+            if len(rows) >= self.chunk_size:
+                self.flush()
+
+    def write_result(self, result: BatchResult) -> None:
+        """Добавить результаты пачки целиком."""
+        self.flush()
+        self._writer.writerows(zip(
+            [result.training_type] * len(result),
+            result.duration.tolist(), result.distance.tolist(),
+            result.speed.tolist(), result.calories.tolist()))
+        self.count += len(result)
+
+    def flush(self) -> None:
+        if self._rows:
+            self._writer.writerows(self._rows)
+            self.count += len(self._rows)
+            self._rows.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> 'CsvExporter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def read_csv(path: str) -> Dict[str, np.ndarray]:
+    """Прочитать выгрузку CSV в столбцы NumPy."""
+    data = np.genfromtxt(path, delimiter=',', names=True, dtype=None,
+                         encoding='utf-8')
+    return {name: np.atleast_1d(data[name]) for name in FIELDS}
+
+
+class NpzExporter:
+    """Запись результатов в столбцовый файл `.npz`.
+
+    Куски по `chunk_size` строк дописываются во временные файлы рядом
+    с целевым; при `close` они собираются в архив без загрузки в память.
+    """
+
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 compress: bool = False) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self.compress = compress
+        self._tmpdir = tempfile.mkdtemp(
+            prefix='.export-', dir=os.path.dirname(os.path.abspath(path)))
+        self._files = {
+            name: open(os.path.join(self._tmpdir, name), 'wb')
+            for name in FIELDS
+        }
+        self._types: Dict[str, int] = {}
+        self._buffers = {name: array('d') for name in NUMERIC_FIELDS}
+        self._codes = array('B')
+        self.count = 0
+
+    def _code(self, training_type: str) -> int:
+        code = self._types.get(training_type)
+        if code is None:
+            code = self._types[training_type] = len(self._types)
+        return code
+
+    def write(self, messages: Iterable[InfoMessage]) -> None:
+        """Добавить сообщения."""
+        duration = self._buffers['duration'].append
+        distance = self._buffers['distance'].append
+        speed = self._buffers['speed'].append
+        calories = self._buffers['calories'].append
+        for message in messages:
+            self._codes.append(self._code(message.training_type))
+            duration(message.duration)
+            distance(message.distance)
+            speed(message.speed)
+            calories(message.calories)
+            if len(self._codes) >= self.chunk_size:
+                self.flush()
+
+    def write_result(self, result: BatchResult) -> None:
+        """Добавить результаты пачки целиком."""
+        self.flush()
+        code = self._code(result.training_type)
+        self._files['training_type'].write(
+            np.full(len(result), code, dtype=np.uint8).data)
+        for name in NUMERIC_FIELDS:
+            column = np.ascontiguousarray(getattr(result, name),
+                                          dtype=np.float64)
+            self._files[name].write(column.data)
+        self.count += len(result)
+
+    def flush(self) -> None:
+        if not self._codes:
+            return
+        self._codes.tofile(self._files['training_type'])
+        self.count += len(self._codes)
+        del self._codes[:]
+        for name in NUMERIC_FIELDS:
+            self._buffers[name].tofile(self._files[name])
+            del self._buffers[name][:]
+
+    def close(self) -> None:
+        """Собрать архив `.npz` и удалить временные файлы."""
+        self.flush()
+        for output in self._files.values():
+            output.close()
+        names = np.array(sorted(self._types, key=self._types.get))
+        dtypes = {name: np.dtype('<f8') for name in NUMERIC_FIELDS}
+        dtypes['training_type'] = np.dtype(np.uint8)
+        method = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+        try:
+            with zipfile.ZipFile(self.path, 'w', method,
+                                 allowZip64=True) as archive:
+                for name in FIELDS:
+                    header = {
+                        'descr': np.lib.format.dtype_to_descr(dtypes[name]),
+                        'fortran_order': False,
+                        'shape': (self.count,),
+                    }
+                    with archive.open(name + '.npy', 'w',
+                                      force_zip64=True) as member, \
+                            open(self._files[name].name, 'rb') as data:
+                        np.lib.format.write_array_header_2_0(member, header)
+                        shutil.copyfileobj(data, member)
+                with archive.open('training_type_names.npy', 'w') as member:
+                    np.lib.format.write_array(member, names)
+        finally:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def __enter__(self) -> 'NpzExporter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
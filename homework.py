@@ -1,8 +1,68 @@
-from dataclasses import dataclass, asdict
-from typing import Union, Type
+"""Модуль фитнес-трекера.
+
+Запуск из командной строки:
+
+    python homework.py              # демонстрационные пакеты
+    python homework.py packets.txt  # пакеты из файла, по одному в строке
+    python homework.py - < packets.txt
+    python homework.py --batch packets.txt  # расчёт пачкой через NumPy
+
+Модуль импортируется при каждом запуске CLI, поэтому NumPy и пакетный
+расчёт (`batch`) загружаются лишь при фактическом использовании.
+"""
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    TextIO, Tuple, Type, Union)
 
 import constants
 
+Package = Tuple[str, List[Union[int, float]]]
+
+# Подготовленные шаблоны сообщений: шаблон -> (форматирование, поля).
+_TEMPLATES: Dict[str, Tuple[Callable[..., str],
+                            Callable[[object], tuple]]] = {}
+
+
+def compile_template(template: str) -> Tuple[Callable[..., str],
+                                             Callable[[object], tuple]]:
+    """Подготовить шаблон сообщения к быстрой подстановке полей.
+
+    Именованные поля шаблона заменяются позиционными, поэтому при выводе
+    значения берутся прямо из атрибутов сообщения без `asdict`.
+    """
+    compiled = _TEMPLATES.get(template)
+    if compiled is None:
+        compiled = _TEMPLATES[template] = _compile_template(template)
+    return compiled
+
+
+def _compile_template(template: str) -> Tuple[Callable[..., str],
+                                              Callable[[object], tuple]]:
+    from string import Formatter
+
+    pieces = []
+    fields = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        pieces.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is None:
+            continue
+        pieces.append('{%d%s%s}' % (
+            len(fields),
+            '!' + conversion if conversion else '',
+            ':' + spec if spec else '',
+        ))
+        fields.append(field)
+    render = ''.join(pieces).format
+    if len(fields) == 1:
+        field = attrgetter(fields[0])
+        return render, lambda message: (field(message),)
+    if not fields:
+        return render, lambda message: ()
+    return render, attrgetter(*fields)
+
 
 @dataclass
 class InfoMessage:
@@ -17,36 +77,290 @@ class InfoMessage:
 
     def get_message(self):
         """Возвращает строку с инфомацией о тренировке."""
-        return self.info.format(**asdict(self))
+        render, fields = compile_template(self.info)
+        return render(*fields(self))
+
+
+def render_many(messages: Iterable[InfoMessage],
+                out: Optional[TextIO] = None) -> Optional[str]:
+    """Вывести сообщения построчно одной записью.
+
+    Каждое сообщение форматируется через `get_message`, поэтому
+    подмена метода (например, `instrumentation`) действует и здесь.
+    Если `out` не передан, возвращает получившийся текст.
+    """
+    lines = [message.get_message() for message in messages]
+    if not lines:
+        text = ''
+    else:
+        lines.append('')
+        text = '\n'.join(lines)
+    if out is None:
+        return text
+    out.write(text)
+    return None
+
+
+# Счётчик фактических расчётов показателей (промахов кэша) по ключу
+# `(класс, метод)`. Включается присваиванием `Counter()`.
+metric_counter: Optional[Counter] = None
+
+# Реестр видов тренировок: код пакета -> класс тренировки.
+WORKOUT_TYPES: Dict[str, Type['Training']] = {}
+
+# Флаг `*args` в `co_flags` кода функции.
+_CO_VARARGS = 0x04
+
+METRIC_SLOTS = ('_distance', '_mean_speed', '_spent_calories')
+
+# Коэффициенты расчёта калорий, которые можно переопределить в профиле.
+CALORIE_COEFFS = (
+    'RUNNING_CALORIE_MULTIPLIER_COEFF',
+    'RUNNING_CALORIE_DOWNGRADER_COEFF',
+    'WALKING_CALORIE_WEIGHT_MULTIPLIER_COEFF',
+    'WALKING_CALORIE_MEAN_SPEED_MULTIPLIER_COEFF',
+    'SWIMMING_INCREASE_CALORIE_COEFF',
+    'SWIMMING_CALORIE_MULTIPLIER_COEFF',
+)
+# Профили коэффициентов (по модели устройства, региону и т. п.):
+# имя профиля -> значения всех коэффициентов из `CALORIE_COEFFS`.
+CALORIE_PROFILES: Dict[str, Dict[str, float]] = {
+    'default': {name: getattr(constants, name) for name in CALORIE_COEFFS},
+}
+# Собранные функции расчёта калорий: (класс, профиль) -> функция.
+_CALORIE_KERNELS: Dict[Tuple[type, str], Callable[..., float]] = {}
+
+
+def register_profile(name: str, **coeffs: float) -> Dict[str, float]:
+    """Добавить профиль коэффициентов калорий.
+
+    Не переданные коэффициенты берутся из профиля `default`.
+    """
+    if name in CALORIE_PROFILES:
+        raise ValueError('Calorie profile {} already exists'.format(name))
+    unknown = set(coeffs).difference(CALORIE_COEFFS)
+    if unknown:
+        raise ValueError(
+            'Unknown calorie coefficients: {}'.format(
+                ', '.join(sorted(unknown)))
+        )
+    profile = dict(CALORIE_PROFILES['default'], **coeffs)
+    CALORIE_PROFILES[name] = profile
+    return profile
+
+
+def calorie_kernel(workout: Type['Training'],
+                   profile: Optional[str] = None) -> Callable[..., float]:
+    """Функция расчёта калорий вида тренировки для профиля.
+
+    Функция собирается один раз на пару (класс, профиль) и работает
+    как с числами, так и с массивами NumPy. По умолчанию используется
+    профиль, выбранный для класса (`Training.calorie_profile`).
+    """
+    if profile is None:
+        profile = workout.calorie_profile
+    try:
+        return _CALORIE_KERNELS[workout, profile]
+    except KeyError:
+        pass
+    try:
+        coeffs = CALORIE_PROFILES[profile]
+    except KeyError:
+        raise KeyError(
+            'Invalid calorie profile. '
+            'Available profiles: {}'.format(', '.join(CALORIE_PROFILES))
+        ) from None
+    kernel = _CALORIE_KERNELS[workout, profile] = (
+        workout.compile_calories(coeffs))
+    return kernel
+
+
+def use_profile(profile: str,
+                workout: Optional[Type['Training']] = None) -> None:
+    """Выбрать профиль коэффициентов для всех тренировок или одного вида.
+
+    Профиль действует на тренировки, калории которых ещё не рассчитаны;
+    уже рассчитанные значения сбрасывает `Training.set_calorie_profile`.
+
+    Функция меняет атрибуты классов для всего процесса без блокировок,
+    поэтому вызывать её нужно при запуске, до старта пулов потоков
+    (`cache`, `ingest`). Чтобы считать отдельные тренировки по другому
+    профилю во время работы, используйте `Training.set_calorie_profile`
+    или аргумент `profile` пакетных функций `batch`.
+    """
+    if profile not in CALORIE_PROFILES:
+        raise KeyError(
+            'Invalid calorie profile. '
+            'Available profiles: {}'.format(', '.join(CALORIE_PROFILES))
+        )
+    workouts = WORKOUT_TYPES.values() if workout is None else (workout,)
+    for cls in workouts:
+        if cls.compile_calories is not Training.compile_calories:
+            cls.calorie_formula = staticmethod(calorie_kernel(cls, profile))
+        cls.calorie_profile = profile
+    if workout is None:
+        Training.calorie_profile = profile
+
+
+def cached_metric(slot: str) -> Callable:
+    """Кэшировать результат метода тренировки в слоте экземпляра.
+
+    Пустой слот (`None`) означает, что показатель ещё не рассчитан.
+    Слоты очищаются при изменении исходных данных (`metric_input`).
+    Встроенные виды тренировок проверяют слот прямо в методе, без
+    обёртки; декоратор нужен для методов новых видов тренировок.
+    """
+    def decorator(method: Callable[[Any], float]) -> Callable[[Any], float]:
+        cached = attrgetter(slot)
+
+        def wrapper(self) -> float:
+            value = cached(self)
+            if value is None:
+                value = method(self)
+                setattr(self, slot, value)
+                if metric_counter is not None:
+                    count_metric(self, method.__name__)
+            return value
+        # Вместо `functools.wraps`, чтобы не импортировать `functools`.
+        wrapper.__name__ = method.__name__
+        wrapper.__qualname__ = method.__qualname__
+        wrapper.__doc__ = method.__doc__
+        wrapper.__wrapped__ = method
+        return wrapper
+    return decorator
+
+
+def count_metric(training: 'Training', method: str) -> None:
+    """Учесть фактический расчёт показателя в `metric_counter`."""
+    metric_counter[type(training).__name__, method] += 1
+
+
+def reset_metrics(training: 'Training') -> None:
+    """Сбросить рассчитанные показатели тренировки."""
+    training._distance = training._mean_speed = None
+    training._spent_calories = None
+
+
+def metric_input(name: str) -> property:
+    """Исходное значение тренировки, при изменении которого сбрасывается кэш.
+
+    Значение хранится в слоте `_<name>`. Чтение идёт через `attrgetter`
+    без вызова Python-функции; конструкторы пишут прямо в слот, а
+    сеттер с очисткой кэша срабатывает только при изменении данных.
+    """
+    private = '_' + name
+
+    def setter(self: 'Training', value: float) -> None:
+        setattr(self, private, value)
+        reset_metrics(self)
+    return property(attrgetter(private), setter)
+
+
+def register_workout(code: str) -> Callable[[Type['Training']],
+                                            Type['Training']]:
+    """Зарегистрировать класс тренировки под кодом пакета.
+
+    Используется как декоратор или через аргумент класса:
+    `class Cycling(Training, code='CYC')`. Список полей пакета берётся
+    из сигнатуры конструктора и проверяется при регистрации.
+    """
+    def decorator(cls: Type['Training']) -> Type['Training']:
+        if code in WORKOUT_TYPES:
+            raise ValueError(
+                'Training type {} is already registered by {}'.format(
+                    code, WORKOUT_TYPES[code].__name__)
+            )
+        init = cls.__init__.__code__
+        if init.co_flags & _CO_VARARGS:
+            raise TypeError(
+                '{}.__init__ must not accept *args'.format(cls.__name__))
+        fields = init.co_varnames[1:init.co_argcount]
+        if fields[:3] != ('action', 'duration', 'weight'):
+            raise TypeError(
+                '{}.__init__ must start with action, duration, '
+                'weight'.format(cls.__name__)
+            )
+        cls.WORKOUT_CODE = code
+        cls.PACKAGE_FIELDS = fields
+        WORKOUT_TYPES[code] = cls
+        return cls
+    return decorator
 
 
 class Training:
     """Базовый класс тренировки."""
+    # `__dict__` оставлен для атрибутов экземпляра вне слотов (подмена
+    # методов в тестах, `set_calorie_profile`) и создаётся лениво. Место
+    # под ссылку на него всё равно занято, поэтому по памяти тренировка
+    # близка к прежней; компактное хранение — `store.TrainingStore`.
+    __slots__ = ('_action', '_duration', '_weight', '__dict__') + METRIC_SLOTS
     LEN_STEP: float = constants.LEN_STEP
     M_IN_KM: int = constants.M_IN_KM
+    # Исходные данные, от которых зависят показатели тренировки.
+    action = metric_input('action')
+    duration = metric_input('duration')
+    weight = metric_input('weight')
+    # Профиль коэффициентов калорий и собранная для него функция расчёта
+    # (`calorie_formula`); выбираются через `use_profile`, а у отдельной
+    # тренировки — через `set_calorie_profile`.
+    calorie_profile: str = 'default'
+    # Код пакета и поля пакета; задаются при регистрации вида тренировки.
+    WORKOUT_CODE: Optional[str] = None
+    PACKAGE_FIELDS: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, code: Optional[str] = None,
+                          **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if code is not None:
+            register_workout(code)(cls)
+        if 'compile_calories' in cls.__dict__:
+            cls.calorie_formula = staticmethod(calorie_kernel(cls))
 
     def __init__(self,
                  action: int,
                  duration: float,
                  weight: float,
                  ) -> None:
-        self.calories = None
-        self.action = action
-        self.duration = duration
-        self.weight = weight
+        self._action = action
+        self._duration = duration
+        self._weight = weight
+        self._distance = self._mean_speed = self._spent_calories = None
 
     def get_distance(self) -> float:
         """Получить дистанцию в км."""
-        return self.action * self.LEN_STEP / constants.M_IN_KM
+        value = self._distance
+        if value is None:
+            value = self._distance = (
+                self.action * self.LEN_STEP / constants.M_IN_KM)
+            if metric_counter is not None:
+                count_metric(self, 'get_distance')
+        return value
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения."""
-        return self.get_distance() / self.duration
-
+        value = self._mean_speed
+        if value is None:
+            value = self._mean_speed = self.get_distance() / self.duration
+            if metric_counter is not None:
+                count_metric(self, 'get_mean_speed')
+        return value
+
+    @cached_metric('_spent_calories')
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
         raise NotImplementedError('Subclasses should implement this!')
 
+    @staticmethod
+    def compile_calories(coeffs: Dict[str, float]) -> Callable[..., float]:
+        """Собрать функцию расчёта калорий с коэффициентами `coeffs`."""
+        raise NotImplementedError('Subclasses should implement this!')
+
+    def set_calorie_profile(self, profile: str) -> None:
+        """Считать калории этой тренировки по профилю `profile`."""
+        self.calorie_formula = calorie_kernel(type(self), profile)
+        self.calorie_profile = profile
+        reset_metrics(self)
+
     def show_training_info(self) -> InfoMessage:
         """Вернуть информационное сообщение о выполненной тренировке."""
         return InfoMessage(type(self).__name__,
@@ -56,105 +370,241 @@ class Training:
                            self.get_spent_calories())
 
 
-class Running(Training):
+class Running(Training, code='RUN'):
     """Тренировка: бег."""
+    __slots__ = ()
     LEN_STEP: float = constants.LEN_STEP
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий в беге."""
-        return (
-            (
-                constants.RUNNING_CALORIE_MULTIPLIER_COEFF
-                * self.get_mean_speed()
-                - constants.RUNNING_CALORIE_DOWNGRADER_COEFF
+        value = self._spent_calories
+        if value is None:
+            value = self._spent_calories = self.calorie_formula(
+                self.get_mean_speed(), self.duration, self.weight)
+            if metric_counter is not None:
+                count_metric(self, 'get_spent_calories')
+        return value
+
+    @staticmethod
+    def compile_calories(coeffs: Dict[str, float]) -> Callable[..., float]:
+        """Собрать функцию расчёта калорий в беге."""
+        multiplier = coeffs['RUNNING_CALORIE_MULTIPLIER_COEFF']
+        downgrader = coeffs['RUNNING_CALORIE_DOWNGRADER_COEFF']
+        m_in_km = constants.M_IN_KM
+        min_in_h = constants.MIN_IN_H
+
+        def calories(speed, duration, weight):
+            return (
+                (multiplier * speed - downgrader)
+                * weight
+                / m_in_km
+                * duration
+                * min_in_h
             )
-            * self.weight
-            / constants.M_IN_KM
-            * self.duration
-            * constants.MIN_IN_H
-        )
+        return calories
 
 
-class SportsWalking(Training):
+class SportsWalking(Training, code='WLK'):
     """Тренировка: спортивная ходьба."""
+    __slots__ = ('_height',)
     LEN_STEP: float = constants.LEN_STEP
+    height = metric_input('height')
 
     def __init__(self, action, duration, weight, height):
         super().__init__(action, duration, weight)
-        self.height = height
+        self._height = height
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий в ходьбе."""
-        return (
-            (
-                constants.WALKING_CALORIE_WEIGHT_MULTIPLIER_COEFF
-                * self.weight
-                + (self.get_mean_speed() ** 2 // self.height)
-                * constants.WALKING_CALORIE_MEAN_SPEED_MULTIPLIER_COEFF
-                * self.weight
+        value = self._spent_calories
+        if value is None:
+            value = self._spent_calories = self.calorie_formula(
+                self.get_mean_speed(), self.duration, self.weight,
+                self.height)
+            if metric_counter is not None:
+                count_metric(self, 'get_spent_calories')
+        return value
+
+    @staticmethod
+    def compile_calories(coeffs: Dict[str, float]) -> Callable[..., float]:
+        """Собрать функцию расчёта калорий в ходьбе."""
+        weight_multiplier = coeffs['WALKING_CALORIE_WEIGHT_MULTIPLIER_COEFF']
+        speed_multiplier = coeffs[
+            'WALKING_CALORIE_MEAN_SPEED_MULTIPLIER_COEFF']
+        min_in_h = constants.MIN_IN_H
+
+        def calories(speed, duration, weight, height):
+            # `//` работает и с массивами NumPy (`np.floor_divide`).
+            return (
+                (
+                    weight_multiplier * weight
+                    + (speed ** 2 // height) * speed_multiplier * weight
+                )
+                * duration * min_in_h
             )
-            * self.duration * constants.MIN_IN_H
-        )
+        return calories
 
 
-class Swimming(Training):
+class Swimming(Training, code='SWM'):
     """Тренировка: плавание."""
+    __slots__ = ('_length_pool', '_count_pool')
     LEN_STEP: float = constants.LEN_PADDLE
+    length_pool = metric_input('length_pool')
+    count_pool = metric_input('count_pool')
 
     def __init__(self, action, duration, weight, length_pool, count_pool):
-        self.length_pool = length_pool
-        self.count_pool = count_pool
+        self._length_pool = length_pool
+        self._count_pool = count_pool
         super().__init__(action, duration, weight)
 
-    def get_distance(self) -> float:
-        """Получить дистанцию в км."""
-        return self.action * self.LEN_STEP / constants.M_IN_KM
-
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения."""
-        return (self.length_pool * self.count_pool
+        value = self._mean_speed
+        if value is None:
+            value = self._mean_speed = (
+                self.length_pool * self.count_pool
                 / constants.M_IN_KM / self.duration)
+            if metric_counter is not None:
+                count_metric(self, 'get_mean_speed')
+        return value
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
-        return ((self.get_mean_speed()
-                 + constants.SWIMMING_INCREASE_CALORIE_COEFF)
-                * constants.SWIMMING_CALORIE_MULTIPLIER_COEFF * self.weight)
+        value = self._spent_calories
+        if value is None:
+            value = self._spent_calories = self.calorie_formula(
+                self.get_mean_speed(), self.duration, self.weight)
+            if metric_counter is not None:
+                count_metric(self, 'get_spent_calories')
+        return value
 
+    @staticmethod
+    def compile_calories(coeffs: Dict[str, float]) -> Callable[..., float]:
+        """Собрать функцию расчёта калорий в плавании."""
+        increase = coeffs['SWIMMING_INCREASE_CALORIE_COEFF']
+        multiplier = coeffs['SWIMMING_CALORIE_MULTIPLIER_COEFF']
 
-def read_package(workout_type: str, data: list) -> Training:
-    """Прочитать данные полученные от датчиков."""
+        def calories(speed, duration, weight):
+            return (speed + increase) * multiplier * weight
+        return calories
 
-    workout_generator: dict[str, Type[
-        Union[Training]]] = {
-        'SWM': Swimming,
-        'RUN': Running,
-        'WLK': SportsWalking
-    }
 
-    if workout_type not in workout_generator:
+def read_package(workout_type: str, data: list) -> Training:
+    """Прочитать данные полученные от датчиков."""
+    try:
+        workout = WORKOUT_TYPES[workout_type]
+    except KeyError:
         raise KeyError(
             'Invalid training type. '
-            'Available types: {}'.format(', '.join(
-                [workout_type for workout_type in workout_generator])
-            )
+            'Available types: {}'.format(', '.join(WORKOUT_TYPES))
+        ) from None
+    if len(data) != len(workout.PACKAGE_FIELDS):
+        raise TypeError(
+            '{} expects {} values per package: {}'.format(
+                workout_type, len(workout.PACKAGE_FIELDS),
+                ', '.join(workout.PACKAGE_FIELDS))
         )
-    training: Union[Training] = workout_generator[workout_type](*data)
-    return training
-
-
-def main(training: Union[Training, Running, SportsWalking, Swimming]) -> None:
-    """Главная функция."""
-    print(training.show_training_info().get_message())
+    return workout(*data)
+
+
+def _number(value: str) -> Union[int, float]:
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def parse_package(line: str) -> Package:
+    """Разобрать строку пакета вида `RUN 15000 1 75`.
+
+    Значения могут разделяться пробелами или запятыми.
+    """
+    fields = line.replace(',', ' ').split()
+    if not fields:
+        raise ValueError('Empty package')
+    return fields[0], [_number(value) for value in fields[1:]]
+
+
+def parse_packages(lines: Iterable[str]) -> Iterator[Package]:
+    """Разобрать строки пакетов, пропуская пустые строки и комментарии `#`."""
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield parse_package(line)
+
+
+DEFAULT_BATCH_SIZE: int = 1024
+
+
+def main(training: Union[Training, Iterable[Union[Training, Package]]],
+         out: Optional[TextIO] = None,
+         batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """Главная функция.
+
+    Принимает тренировку либо последовательность тренировок или сырых
+    пакетов `(код, данные)`. Сообщения выводятся в `out` (по умолчанию
+    stdout) одной записью на каждые `batch_size` тренировок. Если расчёт
+    падает, уже готовые сообщения выводятся до исключения.
+    """
+    if isinstance(training, Training):
+        training = (training,)
+    if out is None:
+        out = sys.stdout
+    messages = []
+    try:
+        for item in training:
+            if not isinstance(item, Training):
+                item = read_package(*item)
+            messages.append(item.show_training_info())
+            if len(messages) >= batch_size:
+                render_many(messages, out)
+                messages.clear()
+    finally:
+        if messages:
+            render_many(messages, out)
+
+
+DEMO_PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+USAGE = 'usage: homework.py [--batch] [FILE | -]'
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    """Точка входа командной строки.
+
+    Без аргументов рассчитывает демонстрационные пакеты, иначе читает
+    пакеты из файла или из stdin (`-`). С `--batch` расчёт идёт пачкой
+    через NumPy (`batch.py`), модуль загружается только в этом режиме.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    use_batch = '--batch' in args
+    paths = [arg for arg in args if arg != '--batch']
+    if len(paths) > 1 or any(
+            path.startswith('-') and path != '-' for path in paths):
+        print(USAGE, file=sys.stderr)
+        return 2
+    source = None
+    if not paths:
+        packages = DEMO_PACKAGES
+    elif paths[0] == '-':
+        packages = parse_packages(sys.stdin)
+    else:
+        source = open(paths[0], encoding='utf-8')
+        packages = parse_packages(source)
+    try:
+        if use_batch:
+            from batch import read_packages_batch
+            render_many(read_packages_batch(packages), sys.stdout)
+        else:
+            main(packages)
+    finally:
+        if source is not None:
+            source.close()
+    return 0
 
 
 if __name__ == '__main__':
-    packages = [
-        ('SWM', [720, 1, 80, 25, 40]),
-        ('RUN', [15000, 1, 75]),
-        ('WLK', [9000, 1, 75, 180]),
-    ]
-
-    for workout_type, data in packages:
-        training = read_package(workout_type, data)
-        main(training)
+    sys.exit(cli())
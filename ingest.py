@@ -0,0 +1,168 @@
+"""Многопоточный приём пакетов от нескольких производителей.
+
+`IngestPool` принимает пакеты из любых потоков через ограниченные
+очереди, рассчитывает их пулом рабочих потоков и передаёт результаты
+приёмнику в отдельном потоке, чтобы медленная запись (сеть, диск) не
+останавливала расчёт.
+
+При `ordered=True` все пакеты одного устройства обрабатывает один и тот
+же рабочий поток, поэтому для каждого устройства порядок результатов
+совпадает с порядком поступления. `close()` дожидается обработки всех
+уже принятых пакетов.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Hashable, List, Optional, Sequence
+
+from homework import InfoMessage, read_package
+
+Sink = Callable[[Hashable, InfoMessage], None]
+ErrorHandler = Callable[[Hashable, str, Sequence[float], Exception], None]
+
+DEFAULT_QUEUE_SIZE: int = 1024
+_STOP = object()
+
+
+@dataclass
+class IngestStats:
+    """Состояние пула приёма."""
+
+    submitted: int
+    processed: int
+    errors: int
+    queue_depth: int
+    output_depth: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Пакетов в секунду с момента запуска."""
+        return self.processed / self.seconds if self.seconds else 0.0
+
+
+class IngestPool:
+    """Пул потоков для расчёта пакетов с ограниченными очередями."""
+
+    def __init__(self, sink: Sink, workers: int = 4,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, ordered: bool = True,
+                 on_error: Optional[ErrorHandler] = None) -> None:
+        if workers < 1:
+            raise ValueError('workers must be positive')
+        self.sink = sink
+        self.ordered = ordered
+        self.on_error = on_error
+        count = workers if ordered else 1
+        self._inputs: List[queue.Queue] = [
+            queue.Queue(maxsize=max(queue_size // count, 1))
+            for _ in range(count)
+        ]
+        self._output: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._puts_done = threading.Condition(self._lock)
+        self._putting = 0
+        self._closed = False
+        self._submitted = 0
+        self._processed = 0
+        self._errors = 0
+        self._started = time.perf_counter()
+        self._workers = [
+            threading.Thread(
+                target=self._work,
+                args=(self._inputs[index % count],),
+                name='ingest-worker-{}'.format(index), daemon=True)
+            for index in range(workers)
+        ]
+        self._writer = threading.Thread(
+            target=self._write, name='ingest-sink', daemon=True)
+        for thread in self._workers:
+            thread.start()
+        self._writer.start()
+
+    def submit(self, device: Hashable, workout_type: str,
+               data: Sequence[float], timeout: Optional[float] = None
+               ) -> None:
+        """Поставить пакет в очередь; блокируется, если очередь полна."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('IngestPool is closed')
+            self._putting += 1
+        target = self._inputs[hash(device) % len(self._inputs)]
+        try:
+            target.put((device, workout_type, data), timeout=timeout)
+        finally:
+            with self._lock:
+                self._putting -= 1
+                self._puts_done.notify_all()
+        with self._lock:
+            self._submitted += 1
+
+    def _work(self, inputs: queue.Queue) -> None:
+        while True:
+            item = inputs.get()
+            if item is _STOP:
+                return
+            device, workout_type, data = item
+            try:
+                message = read_package(workout_type, data).show_training_info()
+            except Exception as exc:
+                with self._lock:
+                    self._errors += 1
+                if self.on_error is not None:
+                    try:
+                        self.on_error(device, workout_type, data, exc)
+                    except Exception:
+                        # Упавший обработчик не должен останавливать поток.
+                        pass
+                continue
+            self._output.put((device, message))
+
+    def _write(self) -> None:
+        while True:
+            item = self._output.get()
+            if item is _STOP:
+                return
+            try:
+                self.sink(*item)
+            except Exception:
+                # Ошибка записи учитывается, а поток продолжает работу,
+                # иначе очереди заполнятся и `submit`/`close` зависнут.
+                with self._lock:
+                    self._errors += 1
+                continue
+            with self._lock:
+                self._processed += 1
+
+    def stats(self) -> IngestStats:
+        with self._lock:
+            return IngestStats(
+                submitted=self._submitted,
+                processed=self._processed,
+                errors=self._errors,
+                queue_depth=sum(inputs.qsize() for inputs in self._inputs),
+                output_depth=self._output.qsize(),
+                seconds=time.perf_counter() - self._started,
+            )
+
+    def close(self) -> None:
+        """Дождаться обработки принятых пакетов и остановить потоки."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            # Пакеты, которые уже кладутся в очередь, должны попасть
+            # в неё раньше сигнала остановки.
+            self._puts_done.wait_for(lambda: not self._putting)
+        for index in range(len(self._workers)):
+            self._inputs[index % len(self._inputs)].put(_STOP)
+        for thread in self._workers:
+            thread.join()
+        self._output.put(_STOP)
+        self._writer.join()
+
+    def __enter__(self) -> 'IngestPool':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,185 @@
+"""Замеры времени горячих участков расчёта.
+
+Инструментирование включается явно (`enable()` или `with instrumented():`)
+и подменяет на время работы `read_package`, методы показателей классов
+тренировок и `InfoMessage.get_message` обёртками с замером времени.
+После `disable()` исходные функции возвращаются на место, поэтому
+в выключенном состоянии накладных расходов нет совсем.
+
+Снимок статистики выгружается в JSON или в текстовом формате Prometheus:
+
+    with instrumented() as registry:
+        ...
+    registry.dump('metrics.prom', 'prometheus')
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import homework
+from stats import LatencyRecorder
+
+METRIC_METHODS: Tuple[str, ...] = (
+    'get_distance', 'get_mean_speed', 'get_spent_calories')
+QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99)
+
+Key = Tuple[str, str]
+
+
+class StageRegistry:
+    """Статистика вызовов по участкам и видам тренировок."""
+
+    def __init__(self, window: int = 10_000) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._stages: Dict[Key, LatencyRecorder] = {}
+
+    def record(self, stage: str, workout: str, seconds: float) -> None:
+        """Учесть один вызов участка `stage` для вида `workout`."""
+        with self._lock:
+            recorder = self._stages.get((stage, workout))
+            if recorder is None:
+                recorder = self._stages[stage, workout] = LatencyRecorder(
+                    self.window)
+            recorder.add(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        """Сводка по участкам: число вызовов, время и перцентили."""
+        with self._lock:
+            items = sorted(self._stages.items())
+            return [
+                dict(stage=stage, workout=workout,
+                     seconds_total=recorder.total,
+                     **recorder.snapshot())
+                for (stage, workout), recorder in items
+            ]
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix: str = 'homework_stage') -> str:
+        """Снимок в текстовом формате Prometheus (тип summary)."""
+        lines = [
+            '# HELP {} Time spent in a calculation stage.'.format(prefix),
+            '# TYPE {} summary'.format(prefix),
+        ]
+        for entry in self.snapshot():
+            labels = 'stage="{stage}",workout="{workout}"'.format(**entry)
+            for quantile in QUANTILES:
+                name = 'p{:g}_ms'.format(quantile * 100)
+                lines.append('{}{{{},quantile="{:g}"}} {!r}'.format(
+                    prefix, labels, quantile, entry[name] / 1000))
+            lines.append('{}_sum{{{}}} {!r}'.format(
+                prefix, labels, entry['seconds_total']))
+            lines.append('{}_count{{{}}} {}'.format(
+                prefix, labels, entry['count']))
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: str, fmt: str = 'json') -> None:
+        """Атомарно записать снимок в файл для внешнего сборщика."""
+        text = self.to_prometheus() if fmt == 'prometheus' else self.to_json()
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temporary = tempfile.mkstemp(dir=directory)
+        with os.fdopen(handle, 'w') as output:
+            output.write(text)
+        os.replace(temporary, path)
+
+
+registry = StageRegistry()
+_patches: List[Tuple[object, str, object, bool]] = []
+
+
+def _timed(function: Callable, stage: str,
+           workout: Callable[..., str]) -> Callable:
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        started = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            registry.record(stage, workout(*args), perf_counter() - started)
+    return wrapper
+
+
+def _patch(owner: object, name: str, value: object) -> None:
+    existed = name in vars(owner)
+    _patches.append((owner, name, getattr(owner, name), existed))
+    setattr(owner, name, value)
+
+
+def _workout_name(workout_type: str, *args) -> str:
+    workout = homework.WORKOUT_TYPES.get(workout_type)
+    return workout.__name__ if workout is not None else workout_type
+
+
+def _class_name(self, *args) -> str:
+    return type(self).__name__
+
+
+def _message_type(message, *args) -> str:
+    return message.training_type
+
+
+def is_enabled() -> bool:
+    return bool(_patches)
+
+
+def enable() -> StageRegistry:
+    """Включить замеры; повторный вызов ничего не меняет."""
+    if _patches:
+        return registry
+    original = homework.read_package
+    timed_read = _timed(original, 'read_package', _workout_name)
+    for module in list(sys.modules.values()):
+        if getattr(module, 'read_package', None) is original:
+            _patch(module, 'read_package', timed_read)
+    for workout in homework.WORKOUT_TYPES.values():
+        for method in METRIC_METHODS:
+            _patch(workout, method,
+                   _timed(getattr(workout, method), method, _class_name))
+    _patch(homework.InfoMessage, 'get_message',
+           _timed(homework.InfoMessage.get_message, 'get_message',
+                  _message_type))
+    return registry
+
+
+def disable() -> None:
+    """Выключить замеры и вернуть исходные функции."""
+    while _patches:
+        owner, name, value, existed = _patches.pop()
+        if existed:
+            setattr(owner, name, value)
+        else:
+            delattr(owner, name)
+
+
+@contextmanager
+def instrumented(reset: bool = True) -> Iterator[StageRegistry]:
+    """Включить замеры на время блока `with`."""
+    if reset:
+        registry.reset()
+    enabled_here = not is_enabled()
+    enable()
+    try:
+        yield registry
+    finally:
+        if enabled_here:
+            disable()
+
+
+def snapshot() -> List[Dict[str, object]]:
+    return registry.snapshot()
+
+
+def dump(path: str, fmt: str = 'json') -> None:
+    registry.dump(path, fmt)
@@ -0,0 +1,148 @@
+"""Двоичный формат пакетов с записями фиксированной длины.
+
+Файл начинается с заголовка `MAGIC`, за ним идут записи `RECORD`:
+код тренировки (3 байта), число значений в пакете (1 байт), 4 байта
+выравнивания и шесть чисел float64 — `action`, `duration`, `weight`,
+`height`, `length_pool`, `count_pool`. Поля, которых нет у данного вида
+тренировки, заполняются NaN.
+
+`PacketReader` отображает файл в память через `mmap` и отдаёт записи
+или структурированный массив NumPy без копирования, поэтому файлы
+размером в гигабайты не загружаются в память целиком.
+"""
+import mmap
+import struct
+from typing import (BinaryIO, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
+
+import numpy as np
+
+from batch import COLUMNS, BatchResult, compute_batch
+
+Package = Tuple[str, List[float]]
+
+MAGIC: bytes = b'TRNPKT01'
+FIELDS: Tuple[str, ...] = (
+    'action', 'duration', 'weight', 'height', 'length_pool', 'count_pool')
+RECORD = struct.Struct('<3sB4x6d')
+RECORD_DTYPE = np.dtype({
+    'names': ['code', 'size'] + list(FIELDS),
+    'formats': ['S3', 'u1'] + ['<f8'] * len(FIELDS),
+    'offsets': [0, 3] + [8 + 8 * index for index in range(len(FIELDS))],
+    'itemsize': RECORD.size,
+})
+_NAN = float('nan')
+
+
+def pack_package(workout_type: str, data: Sequence[float]) -> bytes:
+    """Упаковать пакет в запись фиксированной длины."""
+    if workout_type not in COLUMNS:
+        raise KeyError(
+            'Invalid training type. '
+            'Available types: {}'.format(', '.join(COLUMNS))
+        )
+    names = COLUMNS[workout_type]
+    if len(data) != len(names):
+        raise TypeError('{} expects {} values per package'.format(
+            workout_type, len(names)))
+    values = dict(zip(names, data))
+    return RECORD.pack(workout_type.encode('ascii'), len(data),
+                       *(values.get(name, _NAN) for name in FIELDS))
+
+
+def unpack_package(record: Sequence) -> Package:
+    """Превратить распакованную запись обратно в пакет."""
+    code, _, *values = record
+    workout_type = code.decode('ascii')
+    fields = dict(zip(FIELDS, values))
+    return workout_type, [fields[name] for name in COLUMNS[workout_type]]
+
+
+class PacketWriter:
+    """Запись пакетов в двоичный файл."""
+
+    def __init__(self, path: str, append: bool = False) -> None:
+        self._file: BinaryIO = open(path, 'ab' if append else 'wb')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self.count = 0
+
+    def write(self, workout_type: str, data: Sequence[float]) -> None:
+        """Записать один пакет."""
+        self._file.write(pack_package(workout_type, data))
+        self.count += 1
+
+    def write_many(self, packages: Iterable[Package]) -> None:
+        """Записать несколько пакетов."""
+        for workout_type, data in packages:
+            self.write(workout_type, data)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'PacketWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class PacketReader:
+    """Чтение двоичного файла пакетов через `mmap`.
+
+    Массивы, возвращённые `records`, ссылаются на отображённую память;
+    их нужно освободить до вызова `close`.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as source:
+            header = source.read(len(MAGIC))
+            if header != MAGIC:
+                raise ValueError('{} is not a packet file'.format(path))
+            self._map = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        payload = len(self._map) - len(MAGIC)
+        if payload % RECORD.size:
+            self._map.close()
+            raise ValueError('{} has a truncated record'.format(path))
+
+    def __len__(self) -> int:
+        return (len(self._map) - len(MAGIC)) // RECORD.size
+
+    def __iter__(self) -> Iterator[Package]:
+        with memoryview(self._map) as view:
+            for record in RECORD.iter_unpack(view[len(MAGIC):]):
+                yield unpack_package(record)
+
+    def records(self, start: int = 0,
+                stop: Optional[int] = None) -> np.ndarray:
+        """Структурированный массив записей без копирования."""
+        return np.frombuffer(self._map, dtype=RECORD_DTYPE,
+                             count=len(self), offset=len(MAGIC))[start:stop]
+
+    def iter_batches(self, chunk_size: int = 1_000_000
+                     ) -> Iterator[Tuple[str, np.ndarray, BatchResult]]:
+        """Рассчитать файл кусками по `chunk_size` записей.
+
+        Для каждого вида тренировки в куске возвращает код, номера
+        записей в файле и результаты расчёта.
+        """
+        for start in range(0, len(self), chunk_size):
+            chunk = self.records(start, start + chunk_size)
+            for code in np.unique(chunk['code']):
+                index = np.flatnonzero(chunk['code'] == code)
+                workout_type = code.decode('ascii')
+                selected = chunk[index]
+                columns = {name: selected[name]
+                           for name in COLUMNS[workout_type]}
+                yield (workout_type, index + start,
+                       compute_batch(workout_type, columns))
+            del chunk
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> 'PacketReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,111 @@
+"""Параллельный пересчёт большого архива пакетов на нескольких ядрах.
+
+Пакеты делятся на куски, каждый кусок обрабатывается в отдельном
+процессе `ProcessPoolExecutor`, результаты возвращаются в исходном порядке.
+Небольшие объёмы считаются в текущем процессе: накладные расходы на
+сериализацию там больше выигрыша от параллелизма.
+
+Одновременно в работе держится не больше двух кусков на процесс, поэтому
+длинный генератор пакетов читается по мере расчёта, а не целиком.
+"""
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import chain, islice
+from typing import (Callable, Deque, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple, TypeVar)
+
+from homework import InfoMessage, read_package
+
+Package = Tuple[str, Sequence[float]]
+T = TypeVar('T')
+R = TypeVar('R')
+
+DEFAULT_CHUNK_SIZE: int = 10_000
+
+
+def process_chunk(packages: Sequence[Package]) -> List[InfoMessage]:
+    """Рассчитать сообщения для куска пакетов."""
+    return [
+        read_package(workout_type, data).show_training_info()
+        for workout_type, data in packages
+    ]
+
+
+def chunked(packages: Iterable[Package],
+            chunk_size: int) -> Iterator[List[Package]]:
+    """Разбить пакеты на списки длиной не больше `chunk_size`."""
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+    packages = iter(packages)
+    while True:
+        chunk = list(islice(packages, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bounded_map(executor: Executor, function: Callable[[T], R],
+                items: Iterable[T], max_pending: int) -> Iterator[R]:
+    """Как `executor.map`, но не больше `max_pending` задач сразу.
+
+    `Executor.map` отправляет в пул все элементы ещё до первого
+    результата; здесь следующий элемент берётся из `items`, только
+    когда забран результат самой старой задачи.
+    """
+    if max_pending < 1:
+        raise ValueError('max_pending must be positive')
+    pending: Deque[Future] = deque()
+    try:
+        for item in items:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(executor.submit(function, item))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def default_max_pending(max_workers: Optional[int]) -> int:
+    """Окно задач: два куска на процесс пула."""
+    return 2 * (max_workers or os.cpu_count() or 1)
+
+
+def iter_parallel(packages: Iterable[Package],
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  max_workers: Optional[int] = None,
+                  executor: Optional[Executor] = None
+                  ) -> Iterator[InfoMessage]:
+    """Рассчитать пакеты параллельно, сохраняя порядок результатов.
+
+    Если данных меньше двух кусков или `max_workers == 1`, расчёт идёт
+    в текущем процессе. Можно передать готовый `executor`, чтобы не
+    запускать пул процессов на каждый вызов; для него `max_workers`
+    задаёт только размер окна задач.
+    """
+    chunks = chunked(packages, chunk_size)
+    head = list(islice(chunks, 2))
+    if len(head) < 2 or (max_workers == 1 and executor is None):
+        for chunk in chain(head, chunks):
+            yield from process_chunk(chunk)
+        return
+    max_pending = default_max_pending(max_workers)
+    if executor is not None:
+        for result in bounded_map(executor, process_chunk,
+                                  chain(head, chunks), max_pending):
+            yield from result
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for result in bounded_map(pool, process_chunk,
+                                  chain(head, chunks), max_pending):
+            yield from result
+
+
+def run_parallel(packages: Iterable[Package],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_workers: Optional[int] = None,
+                 executor: Optional[Executor] = None) -> List[InfoMessage]:
+    """Рассчитать пакеты параллельно и вернуть список сообщений."""
+    return list(iter_parallel(packages, chunk_size, max_workers, executor))
@@ -0,0 +1,173 @@
+"""Потоковая обработка пакетов датчиков.
+
+Конвейер собирается из генераторов: разбор строк пакетов, выбор класса
+тренировки через `read_package`, расчёт `InfoMessage` и запись в приёмник.
+Между стадиями стоят ограниченные очереди, поэтому медленный приёмник
+притормаживает источник, а не накапливает данные в памяти.
+
+Ошибка разбора или расчёта одного пакета по умолчанию останавливает
+поток. С обработчиком `on_error` такой пакет пропускается, а обработчик
+получает его (строку, пакет или тренировку — в зависимости от стадии) и
+исключение; сбои источника и приёмника останавливают поток всегда.
+"""
+import queue
+import threading
+from typing import (Callable, Iterable, Iterator, List, Optional, TextIO,
+                    Tuple, TypeVar, Union)
+
+from homework import InfoMessage, Training, parse_package, read_package
+
+Package = Tuple[str, List[Union[int, float]]]
+T = TypeVar('T')
+# Обработчик ошибки пакета: (строка, пакет или тренировка, исключение).
+PacketErrorHandler = Callable[[object, Exception], None]
+
+DEFAULT_QUEUE_SIZE: int = 1024
+# Сколько ждать поток-производитель при закрытии потока данных.
+STOP_TIMEOUT: float = 0.5
+_DONE = object()
+
+
+class _Failure:
+    """Исключение, возникшее в потоке стадии."""
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def _each(function: Callable[[object], T], items: Iterable,
+          on_error: Optional[PacketErrorHandler]) -> Iterator[T]:
+    """Применить `function` к каждому элементу, сообщая об ошибках.
+
+    Исключения самого источника `items` не перехватываются.
+    """
+    for item in items:
+        try:
+            result = function(item)
+        except Exception as exc:
+            if on_error is None:
+                raise
+            on_error(item, exc)
+            continue
+        yield result
+
+
+def parse(lines: Iterable[str],
+          on_error: Optional[PacketErrorHandler] = None
+          ) -> Iterator[Package]:
+    """Стадия разбора строк, без пустых строк и комментариев `#`."""
+    packets = (line.strip() for line in lines)
+    return _each(parse_package,
+                 (line for line in packets
+                  if line and not line.startswith('#')),
+                 on_error)
+
+
+def dispatch(packages: Iterable[Package],
+             on_error: Optional[PacketErrorHandler] = None
+             ) -> Iterator[Training]:
+    """Стадия выбора класса тренировки."""
+    return _each(lambda package: read_package(*package), packages, on_error)
+
+
+def compute(trainings: Iterable[Training],
+            on_error: Optional[PacketErrorHandler] = None
+            ) -> Iterator[InfoMessage]:
+    """Стадия расчёта показателей тренировки."""
+    return _each(lambda training: training.show_training_info(), trainings,
+                 on_error)
+
+
+def write_messages(messages: Iterable[InfoMessage], sink: TextIO) -> int:
+    """Стадия записи: выводит сообщения построчно, возвращает их число."""
+    count = 0
+    for message in messages:
+        sink.write(message.get_message())
+        sink.write('\n')
+        count += 1
+    return count
+
+
+def _put(channel: queue.Queue, stopped: threading.Event, item) -> bool:
+    """Положить элемент в очередь, пока потребитель не остановлен."""
+    while not stopped.is_set():
+        try:
+            channel.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(items: Iterable, channel: queue.Queue,
+             stopped: threading.Event) -> None:
+    """Поток-производитель: перекладывает `items` в очередь."""
+    source = iter(items)
+    try:
+        for item in source:
+            if not _put(channel, stopped, item):
+                return
+    except BaseException as exc:
+        _put(channel, stopped, _Failure(exc))
+        return
+    finally:
+        close = getattr(source, 'close', None)
+        if close is not None:
+            close()
+    _put(channel, stopped, _DONE)
+
+
+def buffered(items: Iterable[T],
+             maxsize: int = DEFAULT_QUEUE_SIZE) -> Iterator[T]:
+    """Вычислять `items` в отдельном потоке через ограниченную очередь.
+
+    Поток-производитель блокируется, когда очередь заполнена, так что
+    в памяти никогда не находится больше `maxsize` элементов.
+
+    При досрочном закрытии производитель может ждать следующий элемент
+    источника (сокет, `tail -f`, stdin). Такой поток не дожидаемся
+    дольше `STOP_TIMEOUT`: он фоновый и сам закроет источник и
+    завершится, как только получит элемент.
+    """
+    channel: queue.Queue = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+    worker = threading.Thread(target=_produce, args=(items, channel, stopped),
+                              daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = channel.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        stopped.set()
+        worker.join(STOP_TIMEOUT)
+
+
+def stream(lines: Iterable[str],
+           maxsize: Optional[int] = DEFAULT_QUEUE_SIZE,
+           on_error: Optional[PacketErrorHandler] = None
+           ) -> Iterator[InfoMessage]:
+    """Собрать конвейер от строк пакетов до сообщений.
+
+    При `maxsize=None` стадии выполняются в одном потоке как цепочка
+    генераторов, иначе каждая стадия работает в своём потоке, и
+    `on_error` вызывается из потока стадии.
+    """
+    stages: List[Callable[..., Iterator]] = [parse, dispatch, compute]
+    items: Iterable = lines
+    for stage in stages:
+        items = stage(items, on_error)
+        if maxsize is not None:
+            items = buffered(items, maxsize)
+    return iter(items)
+
+
+def run_pipeline(lines: Iterable[str], sink: TextIO,
+                 maxsize: Optional[int] = DEFAULT_QUEUE_SIZE,
+                 on_error: Optional[PacketErrorHandler] = None) -> int:
+    """Обработать поток строк пакетов и записать сообщения в `sink`."""
+    return write_messages(stream(lines, maxsize, on_error), sink)
@@ -0,0 +1,297 @@
+"""Повторный прогон архива пакетов через два движка расчёта.
+
+    python replay.py corpus.bin
+    python replay.py packets.txt --left homework_v1 --right homework
+    python replay.py corpus.bin --right batch --rel-tol 1e-12 --workers 4
+
+Архив — двоичный файл `packet_io` или текстовый файл с пакетами по
+одному в строке. Каждый кусок архива считается в отдельном процессе
+обоими движками, сообщения сравниваются поле за полем с допуском.
+Движок задаётся именем из `ENGINES`, именем модуля с функцией
+`read_package` (например, копией прежней версии `homework.py`) или
+строкой `модуль:функция`, где функция принимает список пакетов и
+возвращает список `InfoMessage`.
+
+Завершается с кодом 1, если найдены расхождения сверх допуска.
+"""
+import argparse
+import importlib
+import math
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import chain, islice, zip_longest
+from typing import (Callable, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
+
+from homework import InfoMessage, parse_packages
+from parallel import bounded_map, chunked, default_max_pending
+
+Package = Tuple[str, Sequence[float]]
+Engine = Callable[[Sequence[Package]], List[InfoMessage]]
+
+ENGINES: Dict[str, str] = {
+    'object': 'parallel:process_chunk',
+    'batch': 'batch:read_packages_batch',
+}
+COMPARED_FIELDS: Tuple[str, ...] = ('duration', 'distance', 'speed',
+                                    'calories')
+DEFAULT_CHUNK_SIZE: int = 10_000
+DEFAULT_REL_TOL: float = 1e-9
+# Сколько расхождений сохранять с подробностями; считаются все.
+DEFAULT_MAX_MISMATCHES: int = 100
+
+_engines: Dict[str, Engine] = {}
+
+
+class _Missing:
+    """Результат, который движок не вернул."""
+
+    def __repr__(self) -> str:
+        return '<missing>'
+
+
+MISSING = _Missing()
+
+
+@dataclass
+class Mismatch:
+    """Расхождение результатов двух движков для одного пакета."""
+
+    position: int
+    package: Package
+    field: str
+    left: object
+    right: object
+
+    def __str__(self) -> str:
+        return '#{} {} {}: {!r} != {!r}'.format(
+            self.position, self.package, self.field, self.left, self.right)
+
+
+@dataclass
+class ReplayReport:
+    """Итоги прогона: расхождения и время работы каждого движка."""
+
+    left: str
+    right: str
+    packages: int = 0
+    mismatch_count: int = 0
+    mismatches: List[Mismatch] = field(default_factory=list)
+    left_seconds: float = 0.0
+    right_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatch_count
+
+    def throughput(self, seconds: float) -> float:
+        """Пакетов в секунду за время `seconds`."""
+        return self.packages / seconds if seconds else 0.0
+
+    def merge(self, other: 'ReplayReport', max_mismatches: int) -> None:
+        """Добавить итоги куска к общему отчёту."""
+        self.packages += other.packages
+        self.mismatch_count += other.mismatch_count
+        room = max_mismatches - len(self.mismatches)
+        self.mismatches.extend(other.mismatches[:max(room, 0)])
+        self.left_seconds += other.left_seconds
+        self.right_seconds += other.right_seconds
+
+    def summary(self) -> List[str]:
+        """Строки отчёта для вывода в консоль."""
+        lines = [
+            'packages: {:,}'.format(self.packages),
+            '{}: {:,.0f} packages/s ({:.3f} s)'.format(
+                self.left, self.throughput(self.left_seconds),
+                self.left_seconds),
+            '{}: {:,.0f} packages/s ({:.3f} s)'.format(
+                self.right, self.throughput(self.right_seconds),
+                self.right_seconds),
+            'wall: {:,.0f} packages/s ({:.3f} s)'.format(
+                self.throughput(self.wall_seconds), self.wall_seconds),
+            'mismatches: {:,}'.format(self.mismatch_count),
+        ]
+        lines.extend(str(mismatch) for mismatch in self.mismatches)
+        return lines
+
+
+def object_engine(read_package: Callable, packages: Sequence[Package]
+                  ) -> List[InfoMessage]:
+    """Поэлементный расчёт через `read_package` заданного модуля."""
+    return [
+        read_package(workout_type, list(data)).show_training_info()
+        for workout_type, data in packages
+    ]
+
+
+def resolve_engine(spec: str) -> Engine:
+    """Найти функцию движка по имени или строке `модуль[:функция]`."""
+    engine = _engines.get(spec)
+    if engine is not None:
+        return engine
+    module_name, _, name = ENGINES.get(spec, spec).partition(':')
+    module = importlib.import_module(module_name)
+    if name:
+        engine = getattr(module, name)
+    else:
+        engine = partial(object_engine, module.read_package)
+    _engines[spec] = engine
+    return engine
+
+
+def read_corpus(path: str) -> Iterator[Package]:
+    """Прочитать пакеты из двоичного архива или текстового файла."""
+    from packet_io import MAGIC, PacketReader
+    with open(path, 'rb') as source:
+        binary = source.read(len(MAGIC)) == MAGIC
+    if binary:
+        with PacketReader(path) as reader:
+            yield from reader
+        return
+    with open(path, encoding='utf-8') as lines:
+        yield from parse_packages(lines)
+
+
+def _same(left: object, right: object, rel_tol: float,
+          abs_tol: float) -> bool:
+    if isinstance(left, float) or isinstance(right, float):
+        if math.isnan(left) and math.isnan(right):
+            return True
+        return math.isclose(left, right, rel_tol=rel_tol, abs_tol=abs_tol)
+    return left == right
+
+
+def _run(engine: Engine, packages: Sequence[Package]
+         ) -> Tuple[List[object], float]:
+    """Посчитать кусок движком; ошибки пакетов возвращаются как значения.
+
+    Если движок падает на куске, пакеты пересчитываются по одному,
+    чтобы найти виновные.
+    """
+    started = time.perf_counter()
+    try:
+        results: List[object] = list(engine(packages))
+    except Exception:
+        results = []
+        for package in packages:
+            try:
+                results.extend(engine([package]))
+            except Exception as exc:
+                results.append(exc)
+    return results, time.perf_counter() - started
+
+
+def compare_messages(left: object, right: object, rel_tol: float,
+                     abs_tol: float) -> Iterator[Tuple[str, object, object]]:
+    """Поля, по которым результаты расходятся сверх допуска."""
+    if isinstance(left, _Missing) or isinstance(right, _Missing):
+        yield 'missing', left, right
+        return
+    if isinstance(left, Exception) or isinstance(right, Exception):
+        if type(left) is not type(right):
+            yield 'error', left, right
+        return
+    if left.training_type != right.training_type:
+        yield 'training_type', left.training_type, right.training_type
+    for name in COMPARED_FIELDS:
+        before = getattr(left, name)
+        after = getattr(right, name)
+        if not _same(before, after, rel_tol, abs_tol):
+            yield name, before, after
+
+
+def replay_chunk(start: int, packages: Sequence[Package], left: str,
+                 right: str, rel_tol: float = DEFAULT_REL_TOL,
+                 abs_tol: float = 0.0,
+                 max_mismatches: int = DEFAULT_MAX_MISMATCHES
+                 ) -> ReplayReport:
+    """Прогнать кусок архива через оба движка и сравнить результаты.
+
+    `start` — номер первого пакета куска в архиве. Если движок вернул
+    меньше или больше результатов, чем пакетов, каждая лишняя или
+    недостающая строка считается расхождением по полю `missing`.
+    """
+    report = ReplayReport(left, right, packages=len(packages))
+    left_results, report.left_seconds = _run(resolve_engine(left), packages)
+    right_results, report.right_seconds = _run(
+        resolve_engine(right), packages)
+    for offset, (package, before, after) in enumerate(zip_longest(
+            packages, left_results, right_results, fillvalue=MISSING)):
+        for name, value, other in compare_messages(before, after, rel_tol,
+                                                   abs_tol):
+            report.mismatch_count += 1
+            if len(report.mismatches) < max_mismatches:
+                report.mismatches.append(Mismatch(
+                    start + offset, package, name, value, other))
+    return report
+
+
+def _replay_task(task: tuple) -> ReplayReport:
+    return replay_chunk(*task)
+
+
+def replay(packages: Iterable[Package], left: str = 'object',
+           right: str = 'batch', rel_tol: float = DEFAULT_REL_TOL,
+           abs_tol: float = 0.0, chunk_size: int = DEFAULT_CHUNK_SIZE,
+           max_workers: Optional[int] = None,
+           executor: Optional[Executor] = None,
+           max_mismatches: int = DEFAULT_MAX_MISMATCHES) -> ReplayReport:
+    """Прогнать пакеты через движки `left` и `right` по кускам.
+
+    Как и в `parallel.iter_parallel`, меньше двух кусков или
+    `max_workers == 1` считаются в текущем процессе, а в пуле
+    одновременно находится не больше двух кусков на процесс.
+    """
+    started = time.perf_counter()
+    tasks = (
+        (index * chunk_size, chunk, left, right, rel_tol, abs_tol,
+         max_mismatches)
+        for index, chunk in enumerate(chunked(packages, chunk_size))
+    )
+    head = list(islice(tasks, 2))
+    report = ReplayReport(left, right)
+    if len(head) < 2 or (max_workers == 1 and executor is None):
+        results: Iterable[ReplayReport] = map(_replay_task,
+                                              chain(head, tasks))
+        for result in results:
+            report.merge(result, max_mismatches)
+    elif executor is not None:
+        for result in bounded_map(executor, _replay_task, chain(head, tasks),
+                                  default_max_pending(max_workers)):
+            report.merge(result, max_mismatches)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for result in bounded_map(pool, _replay_task, chain(head, tasks),
+                                      default_max_pending(max_workers)):
+                report.merge(result, max_mismatches)
+    report.wall_seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus', help='двоичный или текстовый архив')
+    parser.add_argument('--left', default='object')
+    parser.add_argument('--right', default='batch')
+    parser.add_argument('--rel-tol', type=float, default=DEFAULT_REL_TOL)
+    parser.add_argument('--abs-tol', type=float, default=0.0)
+    parser.add_argument('--chunk-size', type=int,
+                        default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--show', type=int, default=20,
+                        help='сколько расхождений вывести')
+    args = parser.parse_args(argv)
+    report = replay(read_corpus(args.corpus), args.left, args.right,
+                    args.rel_tol, args.abs_tol, args.chunk_size,
+                    args.workers, max_mismatches=args.show)
+    for line in report.summary():
+        print(line)
+    return 0 if report.ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
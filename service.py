@@ -0,0 +1,278 @@
+"""Сетевой сервис расчёта тренировок на asyncio.
+
+Сервер принимает по TCP пакеты, по одному в строке (формат как у
+`homework.parse_package`), и отвечает строкой `InfoMessage` на каждый
+пакет в том же порядке. Ошибочный пакет получает ответ `ERROR: ...`,
+а команда `STATS` возвращает JSON со статистикой сервера.
+
+Пакеты, пришедшие за один проход цикла событий, рассчитываются одной
+пачкой. Для замеров есть генератор нагрузки:
+
+    python service.py serve --port 8765
+    python service.py bench --port 8765 --connections 1000 --packets 100
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from homework import parse_package, read_package
+from stats import LatencyRecorder, percentiles
+
+DEFAULT_HOST: str = '127.0.0.1'
+DEFAULT_PORT: int = 8765
+MAX_PENDING: int = 256
+LINE_LIMIT: int = 2 ** 16
+STATS_COMMAND: str = 'STATS'
+LINE_TOO_LONG = object()
+
+
+def process_line(line: str) -> str:
+    """Рассчитать ответ на одну строку пакета."""
+    try:
+        training = read_package(*parse_package(line))
+        return training.show_training_info().get_message()
+    except (KeyError, ValueError, TypeError, ArithmeticError) as exc:
+        return 'ERROR: {}'.format(exc)
+
+
+async def read_line(reader: asyncio.StreamReader):
+    """Прочитать строку из потока; `None` — конец потока.
+
+    Строка длиннее лимита буфера отбрасывается целиком, до перевода
+    строки, и вместо неё возвращается `LINE_TOO_LONG`.
+    """
+    too_long = False
+    while True:
+        try:
+            raw = await reader.readuntil(b'\n')
+        except asyncio.IncompleteReadError as exc:
+            if too_long:
+                return LINE_TOO_LONG
+            return exc.partial or None
+        except asyncio.LimitOverrunError as exc:
+            # Данные до разделителя (или весь буфер) уже прочитаны,
+            # выбрасываем их и дочитываем строку до конца.
+            await reader.readexactly(exc.consumed)
+            too_long = True
+            continue
+        return LINE_TOO_LONG if too_long else raw
+
+
+class Batcher:
+    """Собирает пакеты, пришедшие за один проход цикла, в пачку."""
+
+    def __init__(self) -> None:
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._scheduled = False
+        self.latency = LatencyRecorder()
+        self.batches = 0
+        self.max_batch = 0
+
+    def submit(self, line: str) -> asyncio.Future:
+        """Поставить строку в очередь и вернуть future с ответом."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((line, future, time.perf_counter()))
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        self._scheduled = False
+        self.batches += 1
+        self.max_batch = max(self.max_batch, len(batch))
+        for line, future, started in batch:
+            # Сбой на одной строке не должен оставить без ответа
+            # остальные соединения пачки.
+            try:
+                result = process_line(line)
+            except Exception as exc:
+                result = 'ERROR: {}'.format(exc)
+            if not future.cancelled():
+                future.set_result(result)
+            self.latency.add(time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, float]:
+        """Сводка по задержкам и размерам пачек."""
+        summary = self.latency.snapshot()
+        summary['batches'] = self.batches
+        summary['max_batch'] = self.max_batch
+        return summary
+
+
+class TrainingServer:
+    """TCP-сервер расчёта тренировок."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_pending: int = MAX_PENDING) -> None:
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending
+        self.batcher = Batcher()
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Запустить сервер; при `port=0` порт выбирается системой."""
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=LINE_LIMIT)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def stats(self) -> Dict[str, float]:
+        summary = self.batcher.stats()
+        summary['connections'] = self.connections
+        return summary
+
+    def _stats_line(self) -> str:
+        return json.dumps(self.stats())
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        # Ограниченная очередь ответов: клиент, который не читает
+        # ответы, перестаёт читаться сам.
+        replies: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        sender = asyncio.create_task(self._send(replies, writer))
+        try:
+            while True:
+                raw = await read_line(reader)
+                if raw is None:
+                    break
+                if raw is LINE_TOO_LONG:
+                    await replies.put('ERROR: line is longer than {} bytes'
+                                      .format(LINE_LIMIT))
+                    continue
+                try:
+                    line = raw.decode().strip()
+                except UnicodeDecodeError:
+                    await replies.put('ERROR: packet is not valid UTF-8')
+                    continue
+                if not line:
+                    continue
+                if line == STATS_COMMAND:
+                    # Статистика считается в момент отправки, после
+                    # ответов на все предыдущие пакеты соединения.
+                    await replies.put(self._stats_line)
+                else:
+                    await replies.put(self.batcher.submit(line))
+        except ConnectionError:
+            pass
+        finally:
+            await replies.put(None)
+            await sender
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _send(replies: asyncio.Queue,
+                    writer: asyncio.StreamWriter) -> None:
+        # После обрыва соединения очередь продолжает разбираться до
+        # `None`, иначе обработчик навсегда заблокируется на `put`.
+        connected = True
+        while True:
+            reply = await replies.get()
+            if reply is None:
+                return
+            if not connected:
+                continue
+            if isinstance(reply, str):
+                text = reply
+            elif callable(reply):
+                text = reply()
+            else:
+                text = await reply
+            writer.write(text.encode() + b'\n')
+            try:
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+
+
+async def _client(host: str, port: int, lines: List[str],
+                  latencies: List[float]) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    answered = 0
+    try:
+        for line in lines:
+            started = time.perf_counter()
+            writer.write(line.encode() + b'\n')
+            await writer.drain()
+            if not await reader.readline():
+                break
+            latencies.append(time.perf_counter() - started)
+            answered += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return answered
+
+
+async def load_test(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    connections: int = 100, packets: int = 100,
+                    lines: Optional[List[str]] = None) -> Dict[str, float]:
+    """Нагрузить сервер параллельными соединениями.
+
+    Каждое соединение отправляет `packets` пакетов по одному, дожидаясь
+    ответа. Возвращает пропускную способность и перцентили задержек.
+    """
+    lines = lines or [
+        'SWM 720 1 80 25 40', 'RUN 15000 1 75', 'WLK 9000 1 75 180']
+    payload = [lines[index % len(lines)] for index in range(packets)]
+    latencies: List[float] = []
+    started = time.perf_counter()
+    answered = sum(await asyncio.gather(*(
+        _client(host, port, payload, latencies)
+        for _ in range(connections)
+    )))
+    elapsed = time.perf_counter() - started
+    summary = {
+        'connections': connections,
+        'packets': answered,
+        'seconds': elapsed,
+        'packets_per_second': answered / elapsed if elapsed else 0.0,
+    }
+    for name, value in percentiles(latencies).items():
+        summary[name + '_ms'] = value * 1000
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('mode', choices=['serve', 'bench'])
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--packets', type=int, default=100)
+    args = parser.parse_args(argv)
+    if args.mode == 'serve':
+        server = TrainingServer(args.host, args.port)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return
+    print(json.dumps(asyncio.run(load_test(
+        args.host, args.port, args.connections, args.packets)), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Расчёт тренировки по посекундным данным датчика.
+
+Устройство присылает количество шагов или гребков за каждый отсчёт
+(обычно раз в секунду). `SampleSession` принимает отсчёты кусками и
+хранит только накопленные суммы и окно для пиковой скорости, поэтому
+часы данных обрабатываются в постоянной памяти. Дистанция, средняя
+скорость и калории считаются классом тренировки из `homework.py` по
+накопленным итогам — теми же формулами и коэффициентами.
+"""
+from collections import deque
+from typing import Deque, Iterable
+
+import constants
+from homework import WORKOUT_TYPES, InfoMessage, Training
+
+SECONDS_IN_HOUR: int = 60 * 60
+
+
+class SampleSession:
+    """Тренировка, накапливаемая по отсчётам датчика.
+
+    `peak_window` — число отсчётов, по которым усредняется скорость при
+    поиске пиковой; по умолчанию пик ищется по отдельным отсчётам.
+    Дополнительные поля вида тренировки (`height`, `length_pool`,
+    `count_pool`) передаются именованными аргументами.
+    """
+
+    def __init__(self, workout_type: str, weight: float,
+                 sample_seconds: float = 1.0, peak_window: int = 1,
+                 **extras: float) -> None:
+        if workout_type not in WORKOUT_TYPES:
+            raise KeyError(
+                'Invalid training type. '
+                'Available types: {}'.format(', '.join(WORKOUT_TYPES))
+            )
+        if sample_seconds <= 0 or peak_window < 1:
+            raise ValueError('sample_seconds and peak_window must be positive')
+        self.workout = WORKOUT_TYPES[workout_type]
+        names = self.workout.PACKAGE_FIELDS[3:]
+        if set(extras) != set(names):
+            raise TypeError('{} expects extra fields: {}'.format(
+                workout_type, ', '.join(names) or 'none'))
+        self.weight = weight
+        self.extras = extras
+        self.sample_seconds = sample_seconds
+        self.peak_window = peak_window
+        self.action = 0
+        self.samples = 0
+        self.peak_speed = 0.0
+        self._window: Deque[float] = deque()
+        self._window_sum = 0
+        # Скорость (км/ч) для одного шага или гребка за окно пика.
+        self._speed_per_action = (
+            self.workout.LEN_STEP / constants.M_IN_KM
+            / (peak_window * sample_seconds / SECONDS_IN_HOUR)
+        )
+
+    def feed(self, samples: Iterable[float]) -> None:
+        """Добавить кусок отсчётов (список, массив NumPy, генератор)."""
+        if hasattr(samples, 'tolist'):
+            samples = samples.tolist()
+        window = self._window
+        window_sum = self._window_sum
+        peak_sum = self.peak_speed / self._speed_per_action
+        count = 0
+        total = 0
+        for value in samples:
+            count += 1
+            total += value
+            window.append(value)
+            window_sum += value
+            if len(window) > self.peak_window:
+                window_sum -= window.popleft()
+            if len(window) == self.peak_window and window_sum > peak_sum:
+                peak_sum = window_sum
+        self._window_sum = window_sum
+        self.samples += count
+        self.action += total
+        self.peak_speed = peak_sum * self._speed_per_action
+
+    @property
+    def duration(self) -> float:
+        """Длительность в часах."""
+        return self.samples * self.sample_seconds / SECONDS_IN_HOUR
+
+    def to_training(self) -> Training:
+        """Тренировка по накопленным итогам."""
+        return self.workout(self.action, self.duration, self.weight,
+                            **self.extras)
+
+    def show_training_info(self) -> InfoMessage:
+        """Сообщение о тренировке по данным, полученным на текущий момент.
+
+        Пока отсчётов нет, все показатели нулевые.
+        """
+        if not self.samples:
+            return InfoMessage(self.workout.__name__, 0.0, 0.0, 0.0, 0.0)
+        return self.to_training().show_training_info()
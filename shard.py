@@ -0,0 +1,297 @@
+"""Распределение пакетов по рабочим процессам по ключу спортсмена.
+
+`ShardCoordinator` запускает несколько локальных процессов и общается с
+ними через `multiprocessing.Pipe`. Каждый пакет отправляется процессу,
+выбранному по ключу (спортсмен, устройство), поэтому все пакеты одного
+ключа считает один и тот же процесс. Процессы выполняют обычный расчёт
+`read_package` → `InfoMessage` пачками и возвращают сообщения вместе с
+итогами `Totals` по ключам; координатор сливает их в общие итоги.
+Сами сообщения по умолчанию не возвращаются: их получает обработчик
+`on_result` или, при `collect=True`, копит `results` до вызова `join()`.
+
+Процесс выбирается по наибольшему `hash((ключ, номер процесса))` среди
+живых процессов, поэтому при падении процесса на другие переходят только
+его ключи. Пачки, результат которых ещё не получен, отправляются заново
+оставшимся процессам, так что каждый принятый пакет учитывается ровно
+один раз.
+"""
+import multiprocessing
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from itertools import count
+from multiprocessing.connection import Connection, wait
+from typing import (Callable, Dict, Hashable, Iterable, List, Optional,
+                    Sequence, Tuple)
+
+from aggregation import Totals
+from homework import InfoMessage, read_package
+
+# Пакет в пачке: (номер, ключ, код тренировки, данные).
+Item = Tuple[int, Hashable, str, Sequence[float]]
+Result = Tuple[int, Hashable, InfoMessage]
+# Ошибка расчёта: (номер, ключ, код тренировки, данные, описание).
+Error = Tuple[int, Hashable, str, Sequence[float], str]
+ResultHandler = Callable[[Hashable, InfoMessage], None]
+
+DEFAULT_BATCH_SIZE: int = 256
+DEFAULT_MAX_IN_FLIGHT: int = 4
+
+
+@dataclass
+class ShardStats:
+    """Состояние координатора."""
+
+    submitted: int
+    processed: int
+    errors: int
+    workers: int
+    rebalances: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Пакетов в секунду с момента запуска."""
+        return self.processed / self.seconds if self.seconds else 0.0
+
+
+def process_batch(items: Sequence[Item], collect: bool = True
+                  ) -> Tuple[List[Result], Dict[Hashable, Totals],
+                             List[Error]]:
+    """Рассчитать пачку пакетов и итоги по ключам.
+
+    При `collect=False` сообщения не возвращаются, только итоги.
+    """
+    results: List[Result] = []
+    totals: Dict[Hashable, Totals] = {}
+    errors: List[Error] = []
+    for seq, key, workout_type, data in items:
+        try:
+            message = read_package(workout_type, data).show_training_info()
+        except Exception as exc:
+            errors.append((seq, key, workout_type, data, repr(exc)))
+            continue
+        if key not in totals:
+            totals[key] = Totals()
+        totals[key].add(message)
+        if collect:
+            results.append((seq, key, message))
+    return results, totals, errors
+
+
+def serve(conn: Connection, collect: bool = True) -> None:
+    """Цикл рабочего процесса: пачка на входе, результаты на выходе."""
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        batch_id, items = request
+        conn.send((batch_id,) + process_batch(items, collect))
+
+
+class ShardCoordinator:
+    """Координатор локальных рабочих процессов с перебалансировкой."""
+
+    def __init__(self, workers: int = 4,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 collect: bool = False,
+                 on_result: Optional[ResultHandler] = None) -> None:
+        if workers < 1:
+            raise ValueError('workers must be positive')
+        if batch_size < 1 or max_in_flight < 1:
+            raise ValueError('batch_size and max_in_flight must be positive')
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.on_result = on_result
+        # Сообщения при `collect=True` без `on_result`: (номер, ключ,
+        # сообщение); `join()` возвращает их и очищает список.
+        self.results: List[Result] = []
+        self.totals: Dict[Hashable, Totals] = {}
+        self.errors: List[Error] = []
+        self.processes: List[multiprocessing.Process] = []
+        self._conns: List[Connection] = []
+        for _ in range(workers):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=serve,
+                args=(child, collect or on_result is not None), daemon=True)
+            process.start()
+            # Закрываем свой конец процесса сразу, чтобы его смерть
+            # давала EOF и чтобы следующие процессы его не унаследовали.
+            child.close()
+            self.processes.append(process)
+            self._conns.append(parent)
+        self._alive = set(range(workers))
+        self._buffers: Dict[int, List[Item]] = {}
+        self._pending: Dict[int, Dict[int, List[Item]]] = {
+            worker: {} for worker in range(workers)}
+        self._events: queue.Queue = queue.Queue()
+        self._seq = count()
+        self._batch_ids = count()
+        self._closed = False
+        self._submitted = 0
+        self._processed = 0
+        self._rebalances = 0
+        self._started = time.perf_counter()
+        self._receiver = threading.Thread(
+            target=self._receive, name='shard-receiver', daemon=True)
+        self._receiver.start()
+
+    def route(self, key: Hashable) -> int:
+        """Номер живого процесса, который отвечает за `key`."""
+        if not self._alive:
+            raise RuntimeError('All shard workers have died')
+        return max(self._alive, key=lambda worker: hash((key, worker)))
+
+    def submit(self, key: Hashable, workout_type: str,
+               data: Sequence[float]) -> None:
+        """Принять пакет; блокируется, если у процесса много пачек."""
+        if self._closed:
+            raise RuntimeError('ShardCoordinator is closed')
+        self._submitted += 1
+        self._put((next(self._seq), key, workout_type, data))
+
+    def submit_many(self, packets: Iterable[Tuple[Hashable, str,
+                                                  Sequence[float]]]
+                    ) -> None:
+        for key, workout_type, data in packets:
+            self.submit(key, workout_type, data)
+
+    def flush(self) -> None:
+        """Отправить неполные пачки."""
+        for worker in list(self._buffers):
+            self._dispatch(worker)
+
+    def join(self) -> List[Result]:
+        """Дождаться результатов всех принятых пакетов.
+
+        Возвращает сообщения, накопленные в `results` с прошлого вызова,
+        и очищает список, чтобы долгая работа не копила их без конца.
+        """
+        self._wait()
+        results, self.results = self.results, []
+        return results
+
+    def stats(self) -> ShardStats:
+        return ShardStats(
+            submitted=self._submitted,
+            processed=self._processed,
+            errors=len(self.errors),
+            workers=len(self._alive),
+            rebalances=self._rebalances,
+            seconds=time.perf_counter() - self._started,
+        )
+
+    def close(self) -> None:
+        """Дождаться результатов и остановить рабочие процессы.
+
+        Сообщения, не забранные через `join()`, остаются в `results`.
+        """
+        if self._closed:
+            return
+        self._wait()
+        self._closed = True
+        for worker in self._alive:
+            try:
+                self._conns[worker].send(None)
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join()
+        self._receiver.join()
+        for conn in self._conns:
+            conn.close()
+
+    def __enter__(self) -> 'ShardCoordinator':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _wait(self) -> None:
+        self.flush()
+        while self._buffers or any(self._pending.values()):
+            self._handle(self._events.get())
+            self.flush()
+
+    def _put(self, item: Item) -> None:
+        worker = self.route(item[1])
+        buffer = self._buffers.setdefault(worker, [])
+        buffer.append(item)
+        if len(buffer) >= self.batch_size:
+            self._dispatch(worker)
+
+    def _dispatch(self, worker: int) -> None:
+        items = self._buffers.pop(worker, None)
+        if not items:
+            return
+        pending = self._pending[worker]
+        while len(pending) >= self.max_in_flight and worker in self._alive:
+            self._handle(self._events.get())
+        if worker not in self._alive:
+            for item in items:
+                self._put(item)
+            return
+        batch_id = next(self._batch_ids)
+        pending[batch_id] = items
+        try:
+            self._conns[worker].send((batch_id, items))
+        except OSError:
+            # Процесс упал. Ответы, которые он успел отправить, ещё лежат
+            # в очереди событий раньше сигнала о смерти, поэтому
+            # перебалансировку делает обработчик этого сигнала.
+            while worker in self._alive:
+                self._handle(self._events.get())
+
+    def _handle(self, event: Tuple[str, int, Optional[tuple]]) -> None:
+        kind, worker, payload = event
+        if kind == 'dead':
+            if worker in self._alive:
+                self._rebalance(worker)
+            return
+        batch_id, results, totals, errors = payload
+        items = self._pending[worker].pop(batch_id)
+        self._processed += len(items)
+        for key, batch_totals in totals.items():
+            if key in self.totals:
+                self.totals[key].merge(batch_totals)
+            else:
+                self.totals[key] = batch_totals
+        self.errors.extend(errors)
+        if self.on_result is None:
+            self.results.extend(results)
+            return
+        for _, key, message in results:
+            self.on_result(key, message)
+
+    def _rebalance(self, worker: int) -> None:
+        """Передать пакеты упавшего процесса остальным."""
+        self._alive.discard(worker)
+        self._rebalances += 1
+        self.processes[worker].join()
+        items = [item for batch in self._pending.pop(worker).values()
+                 for item in batch]
+        self._pending[worker] = {}
+        items.extend(self._buffers.pop(worker, ()))
+        items.sort(key=lambda item: item[0])
+        for item in items:
+            self._put(item)
+
+    def _receive(self) -> None:
+        """Поток чтения ответов всех процессов в очередь событий."""
+        workers = {conn: worker for worker, conn in enumerate(self._conns)}
+        while workers:
+            for conn in wait(list(workers)):
+                worker = workers[conn]
+                try:
+                    payload = conn.recv()
+                except (EOFError, OSError):
+                    del workers[conn]
+                    self._events.put(('dead', worker, None))
+                    continue
+                self._events.put(('result', worker, payload))
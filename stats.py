@@ -0,0 +1,49 @@
+"""Вспомогательные средства для сбора статистики задержек."""
+from collections import deque
+from math import ceil
+from typing import Dict, Iterable, Sequence
+
+DEFAULT_PERCENTILES: Sequence[float] = (50, 90, 99, 99.9)
+
+
+def percentiles(values: Iterable[float],
+                points: Sequence[float] = DEFAULT_PERCENTILES
+                ) -> Dict[str, float]:
+    """Рассчитать перцентили методом ближайшего ранга."""
+    ordered = sorted(values)
+    if not ordered:
+        return {'p{:g}'.format(point): 0.0 for point in points}
+    result = {}
+    for point in points:
+        rank = max(ceil(point / 100 * len(ordered)), 1)
+        result['p{:g}'.format(point)] = ordered[rank - 1]
+    return result
+
+
+class LatencyRecorder:
+    """Накопитель задержек с ограниченной выборкой последних значений."""
+
+    def __init__(self, window: int = 100_000) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: deque = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        """Учесть одно измерение в секундах."""
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self._samples.append(seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Вернуть сводку: число измерений, среднее и перцентили в мс."""
+        summary = {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'max_ms': self.max * 1000,
+        }
+        for name, value in percentiles(self._samples).items():
+            summary[name + '_ms'] = value * 1000
+        return summary
@@ -0,0 +1,74 @@
+"""Компактное хранилище тренировок в виде столбцов.
+
+`TrainingStore` держит N тренировок в типизированных буферах `array`
+(структура массивов) и создаёт объект `Training` только по запросу.
+"""
+from array import array
+from typing import Iterable, Iterator, List, Sequence, Tuple, Union
+
+from homework import Training, read_package
+
+Package = Tuple[str, List[Union[int, float]]]
+
+# Наибольшее число значений в пакете (у плавания).
+MAX_FIELDS: int = 5
+
+
+class TrainingStore:
+    """Хранилище пакетов тренировок в типизированных столбцах."""
+
+    def __init__(self, packages: Iterable[Package] = ()) -> None:
+        self._codes: List[str] = []
+        self._code_index: dict = {}
+        self._code = array('B')
+        self._size = array('B')
+        self._fields = tuple(array('d') for _ in range(MAX_FIELDS))
+        self.extend(packages)
+
+    def __len__(self) -> int:
+        return len(self._code)
+
+    def __getitem__(self, index: int) -> Training:
+        return read_package(*self.row(index))
+
+    def __iter__(self) -> Iterator[Training]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, workout_type: str, data: Sequence[float]) -> None:
+        """Добавить пакет тренировки."""
+        if len(data) > MAX_FIELDS:
+            raise ValueError(
+                'Package has {} values, at most {} supported'.format(
+                    len(data), MAX_FIELDS)
+            )
+        if workout_type not in self._code_index:
+            self._code_index[workout_type] = len(self._codes)
+            self._codes.append(workout_type)
+        self._code.append(self._code_index[workout_type])
+        self._size.append(len(data))
+        for position, column in enumerate(self._fields):
+            column.append(data[position] if position < len(data) else 0.0)
+
+    def extend(self, packages: Iterable[Package]) -> None:
+        """Добавить несколько пакетов."""
+        for workout_type, data in packages:
+            self.append(workout_type, data)
+
+    def row(self, index: int) -> Package:
+        """Вернуть пакет по индексу в виде `(код, данные)`."""
+        size = self._size[index]
+        return (self._codes[self._code[index]],
+                [column[index] for column in self._fields[:size]])
+
+    def column(self, position: int) -> memoryview:
+        """Вернуть столбец значений без копирования."""
+        return memoryview(self._fields[position])
+
+    @property
+    def nbytes(self) -> int:
+        """Объём памяти, занятый буферами данных."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self._code, self._size) + self._fields
+        )
@@ -0,0 +1,72 @@
+import pytest
+
+import homework
+from aggregation import (SECONDS_IN_DAY, AthleteAggregator, SlidingWindow,
+                         TumblingWindow, week_bucket)
+
+RUN = homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+SWIM = homework.read_package('SWM', [720, 1, 80, 25, 40]).show_training_info()
+# Понедельник, 2 января 2023 года, 00:00 UTC.
+MONDAY = 1672617600
+
+
+def test_week_starts_on_monday():
+    assert week_bucket(MONDAY) == week_bucket(MONDAY + 6 * SECONDS_IN_DAY)
+    assert week_bucket(MONDAY) != week_bucket(MONDAY - 1)
+
+
+def test_tumbling_periods():
+    aggregator = AthleteAggregator()
+    aggregator.add('ann', MONDAY + 10, RUN)
+    aggregator.add('ann', MONDAY + 20, SWIM)
+    aggregator.add('ann', MONDAY + SECONDS_IN_DAY, RUN)
+    aggregator.add('bob', MONDAY, RUN)
+
+    day = aggregator.period('ann', 'day', MONDAY)
+    assert day.count == 2
+    assert day.distance == pytest.approx(RUN.distance + SWIM.distance)
+    assert day.max_speed == RUN.speed
+    assert aggregator.period('ann', 'week', MONDAY, 'Running').count == 2
+    month = aggregator.period('ann', 'month', MONDAY)
+    assert month.count == 3
+    assert month.calories == pytest.approx(2 * RUN.calories + SWIM.calories)
+    assert aggregator.period('eve', 'day', MONDAY).count == 0
+
+
+def test_tumbling_window_keeps_newest_periods_on_late_events():
+    window = TumblingWindow('day', retention=2)
+    day1, day2, day3 = (MONDAY + day * SECONDS_IN_DAY for day in range(3))
+    for timestamp in (day1, day3, day2, day3):
+        window.add(timestamp, RUN)
+    assert window.get(day1).count == 0
+    assert (window.get(day2).count, window.get(day3).count) == (1, 2)
+    window.add(day1 + 10, RUN)
+    assert window.get(day1).count == 0
+    assert (window.get(day2).count, window.get(day3).count) == (1, 2)
+    assert window.dropped == 1
+    window.add(day3 + SECONDS_IN_DAY, SWIM)
+    assert window.get(day2).count == 0
+    assert window.get(day3).count == 2
+
+
+def test_sliding_window_expires_old_sessions():
+    window = SlidingWindow(length=2 * SECONDS_IN_DAY, resolution=3600)
+    fast = homework.InfoMessage('Running', 1, 10, 10, 100)
+    window.add(MONDAY, fast)
+    window.add(MONDAY + SECONDS_IN_DAY, RUN)
+    assert window.get(MONDAY + SECONDS_IN_DAY).count == 2
+    assert window.get(MONDAY + SECONDS_IN_DAY).max_speed == 10
+    later = window.get(MONDAY + 3 * SECONDS_IN_DAY)
+    assert later.count == 1
+    assert later.max_speed == RUN.speed
+    assert later.mean_speed == pytest.approx(RUN.speed)
+    assert window.get(MONDAY + 10 * SECONDS_IN_DAY).count == 0
+
+
+def test_recent_across_types():
+    aggregator = AthleteAggregator(sliding=[SECONDS_IN_DAY])
+    aggregator.add('ann', MONDAY, RUN)
+    aggregator.add('ann', MONDAY + 3600, SWIM)
+    assert aggregator.recent('ann', SECONDS_IN_DAY, MONDAY + 7200).count == 2
+    assert aggregator.recent(
+        'ann', SECONDS_IN_DAY, MONDAY + 7200, 'Swimming').count == 1
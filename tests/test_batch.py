@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+import homework
+
+batch = pytest.importorskip('batch')
+
+
+def make_packages(count, seed=0):
+    rnd = random.Random(seed)
+    packages = []
+    for _ in range(count):
+        workout_type = rnd.choice(['RUN', 'WLK', 'SWM'])
+        data = [rnd.randint(1, 20000), rnd.uniform(0.1, 5),
+                rnd.uniform(40, 120)]
+        if workout_type == 'WLK':
+            data.append(rnd.randint(120, 210))
+        elif workout_type == 'SWM':
+            data.extend([rnd.randint(10, 50), rnd.randint(1, 80)])
+        packages.append((workout_type, data))
+    return packages
+
+
+@pytest.mark.parametrize('input_data', [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+])
+def test_compute_batch_matches_training(input_data):
+    workout_type, data = input_data
+    columns = {
+        name: [value]
+        for name, value in zip(batch.COLUMNS[workout_type], data)
+    }
+    result = batch.compute_batch(workout_type, columns)
+    expected = homework.read_package(*input_data).show_training_info()
+    assert result.to_messages() == [expected]
+
+
+def test_read_packages_batch_keeps_order_and_values():
+    packages = make_packages(500)
+    expected = [
+        homework.read_package(*package).show_training_info()
+        for package in packages
+    ]
+    assert batch.read_packages_batch(packages) == expected
+
+
+def test_compute_batch_unknown_type():
+    with pytest.raises(KeyError):
+        batch.compute_batch('BIK', {})
+
+
+@pytest.mark.parametrize('package', [
+    ('RUN', [15000, 0, 75]),
+    ('WLK', [9000, 1, 75, 0]),
+    ('SWM', [720, 0, 80, 25, 40]),
+])
+def test_zero_divisor_fails_like_training(package, tmp_path):
+    with pytest.raises(ZeroDivisionError):
+        homework.read_package(*package).show_training_info()
+    with pytest.raises(ZeroDivisionError):
+        batch.read_packages_batch([('RUN', [15000, 1, 75]), package])
+    packets = tmp_path / 'packets.txt'
+    packets.write_text('RUN 15000 1 75\n{} {}\n'.format(
+        package[0], ' '.join(map(str, package[1]))))
+    for args in ([str(packets)], [str(packets), '--batch']):
+        with pytest.raises(ZeroDivisionError):
+            homework.cli(args)
+
+
+def test_batch_uses_calorie_profile(monkeypatch):
+    monkeypatch.setattr(homework, 'CALORIE_PROFILES',
+                        dict(homework.CALORIE_PROFILES))
+    homework.register_profile(
+        'batch', RUNNING_CALORIE_MULTIPLIER_COEFF=20,
+        WALKING_CALORIE_WEIGHT_MULTIPLIER_COEFF=0.04,
+        SWIMMING_INCREASE_CALORIE_COEFF=1.2)
+    packages = make_packages(200, seed=3)
+    expected = []
+    for package in packages:
+        training = homework.read_package(*package)
+        training.set_calorie_profile('batch')
+        expected.append(training.show_training_info())
+    assert batch.read_packages_batch(packages, profile='batch') == expected
+    assert batch.read_packages_batch(packages) != expected
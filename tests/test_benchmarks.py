@@ -0,0 +1,37 @@
+from collections import Counter
+
+import homework
+from benchmarks import bench_homework, compare
+from benchmarks.datasets import iter_chunks
+
+
+def test_bench_cases_cover_every_workout_type():
+    names = {case.name for case in bench_homework.build_cases()}
+    for class_name in ('Running', 'SportsWalking', 'Swimming'):
+        for method in ('get_distance', 'get_mean_speed',
+                       'get_spent_calories'):
+            assert '{}.{}'.format(class_name, method) in names
+    assert {'read_package', 'InfoMessage.get_message'} <= names
+
+
+def test_bench_report_and_compare():
+    report = bench_homework.run([50], bench_homework.build_cases())
+    results = {(result['case'], result['size']): result
+               for result in report['results']}
+    assert all(result['ops_per_second'] > 0 for result in results.values())
+    slower = {key: dict(result, ops_per_second=result['ops_per_second'] / 2)
+              for key, result in results.items()}
+    assert compare.compare(results, results, 10) == []
+    assert len(compare.compare(results, slower, 10)) == len(results)
+
+
+def test_latency_samples_are_not_cache_hits(monkeypatch):
+    counter = Counter()
+    monkeypatch.setattr(homework, 'metric_counter', counter)
+    case = next(case for case in bench_homework.build_cases()
+                if case.name == 'Running.get_spent_calories')
+    chunk = next(iter_chunks(20, 20, 0, case.workout_types))
+    case.run(case.prepare(chunk))
+    counter.clear()
+    bench_homework._sample_latencies(case, chunk, 5, 0)
+    assert counter['Running', 'get_spent_calories'] == 5
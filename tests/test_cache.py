@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+import homework
+from cache import PacketCache, compute_info
+
+
+def test_hits_return_equal_independent_messages():
+    cache = PacketCache(maxsize=4)
+    first = cache.get_info('RUN', [15000, 1, 75])
+    second = cache.get_info('RUN', [15000, 1, 75])
+    assert first == second == compute_info('RUN', [15000, 1, 75])
+    assert first is not second
+    assert first.get_message() == second.get_message()
+    second.calories = 0
+    assert cache.get_info('RUN', [15000, 1, 75]) == first
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+
+
+def test_lru_eviction():
+    cache = PacketCache(maxsize=2)
+    cache.get_info('RUN', [1, 1, 1])
+    cache.get_info('RUN', [2, 1, 1])
+    cache.get_info('RUN', [1, 1, 1])
+    cache.get_info('RUN', [3, 1, 1])
+    assert cache.stats().evictions == 1
+    cache.get_info('RUN', [1, 1, 1])
+    assert cache.stats().hits == 2
+    cache.get_info('RUN', [2, 1, 1])
+    assert cache.stats().misses == 4
+
+
+def test_ttl_expiration():
+    now = [0.0]
+    cache = PacketCache(ttl=10, clock=lambda: now[0])
+    cache.get_info('WLK', [9000, 1, 75, 180])
+    now[0] = 5
+    cache.get_info('WLK', [9000, 1, 75, 180])
+    now[0] = 20
+    cache.get_info('WLK', [9000, 1, 75, 180])
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expirations) == (1, 2, 1)
+
+
+def test_errors_are_not_cached():
+    cache = PacketCache()
+    with pytest.raises(KeyError):
+        cache.get_info('BIK', [1, 2, 3])
+    assert len(cache) == 0
+
+
+def test_concurrent_access():
+    cache = PacketCache(maxsize=8)
+    packages = [('RUN', [action, 1, 75]) for action in range(1, 17)]
+    expected = {action: compute_info(*package)
+                for action, package in enumerate(packages, 1)}
+    errors = []
+
+    def worker():
+        for _ in range(50):
+            for action, package in enumerate(packages, 1):
+                if cache.get_info(*package) != expected[action]:
+                    errors.append(package)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    stats = cache.stats()
+    assert stats.hits + stats.misses == 4 * 50 * 16
+    assert stats.size <= 8
+
+
+def test_key_follows_calorie_profile(monkeypatch):
+    monkeypatch.setattr(homework, 'CALORIE_PROFILES',
+                        dict(homework.CALORIE_PROFILES))
+    homework.register_profile('eu', SWIMMING_CALORIE_MULTIPLIER_COEFF=4)
+    cache = PacketCache()
+    try:
+        assert cache.get_info('SWM', [720, 1, 80, 25, 40]).calories == 336.0
+        homework.use_profile('eu')
+        assert cache.get_info('SWM', [720, 1, 80, 25, 40]).calories == 672.0
+    finally:
+        homework.use_profile('default')
+    assert cache.get_info('SWM', [720, 1, 80, 25, 40]).calories == 336.0
+    assert cache.stats().hits == 1
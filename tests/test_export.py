@@ -0,0 +1,54 @@
+import pytest
+
+import homework
+
+np = pytest.importorskip('numpy')
+export = pytest.importorskip('export')
+batch = pytest.importorskip('batch')
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+] * 5
+MESSAGES = [homework.read_package(*package).show_training_info()
+            for package in PACKAGES]
+
+
+def check_columns(columns, messages):
+    assert list(columns['training_type']) == [
+        message.training_type for message in messages]
+    for name in export.NUMERIC_FIELDS:
+        assert columns[name].tolist() == [
+            getattr(message, name) for message in messages]
+
+
+def test_csv_export(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    with export.CsvExporter(path, chunk_size=3) as exporter:
+        exporter.write(MESSAGES[:7])
+    result = batch.compute_batch('RUN', {
+        'action': [15000], 'duration': [1], 'weight': [75]})
+    with export.CsvExporter(path, append=True) as exporter:
+        exporter.write(MESSAGES[7:])
+        exporter.write_result(result)
+    check_columns(export.read_csv(path), MESSAGES + result.to_messages())
+
+
+def test_npz_export(tmp_path):
+    path = str(tmp_path / 'results.npz')
+    result = batch.compute_batch('WLK', {
+        'action': [9000, 100], 'duration': [1, 2], 'weight': [75, 60],
+        'height': [180, 170]})
+    with export.NpzExporter(path, chunk_size=4) as exporter:
+        exporter.write(MESSAGES)
+        exporter.write_result(result)
+        exporter.write(MESSAGES[:1])
+    expected = MESSAGES + result.to_messages() + MESSAGES[:1]
+    with np.load(path) as archive:
+        names = archive['training_type_names']
+        columns = {name: archive[name] for name in export.NUMERIC_FIELDS}
+        columns['training_type'] = names[archive['training_type']]
+    check_columns(columns, expected)
+    assert not list(tmp_path.glob('.export-*'))
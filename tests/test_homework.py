@@ -1,8 +1,11 @@
 import re
+from collections import Counter
+import sys
 import pytest
 import types
 import inspect
-from conftest import Capturing
+import subprocess
+from conftest import BASE_DIR, Capturing
 
 try:
     import homework
@@ -363,3 +366,239 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+@pytest.mark.parametrize('input_data', [
+    ['Swimming', 1, 0.9936, 1.0, 336.0],
+    ['Running', 12, 0.7839, 0.065325, -81.320328],
+    ['SportsWalking', 1.5, 5.85, 3.9, 157.50000000000003],
+])
+def test_InfoMessage_get_message_matches_template(input_data):
+    message = homework.InfoMessage(*input_data)
+    expected = message.info.format(
+        training_type=message.training_type,
+        duration=message.duration,
+        distance=message.distance,
+        speed=message.speed,
+        calories=message.calories,
+    )
+    assert message.get_message() == expected, (
+        'Метод `get_message` должен выводить строку по шаблону '
+        '`INFO_MESSAGE` без изменений.'
+    )
+
+
+def test_render_many():
+    messages = [
+        homework.read_package(*package).show_training_info()
+        for package in [('SWM', [720, 1, 80, 25, 40]),
+                        ('RUN', [1206, 12, 6]),
+                        ('WLK', [9000, 1, 75, 180])]
+    ]
+    custom = homework.InfoMessage('Running', 1, 2, 3, 4,
+                                  info='{training_type}: {calories:.1f} {{}}')
+    expected = ''.join(
+        message.get_message() + '\n' for message in messages + [custom])
+    assert custom.get_message() == 'Running: 4.0 {}'
+    assert homework.render_many(messages + [custom]) == expected
+    with Capturing() as output:
+        homework.render_many(messages, out=sys.stdout)
+    assert output == [message.get_message() for message in messages]
+    assert homework.render_many([]) == ''
+
+
+def test_training_metrics_are_cached(monkeypatch):
+    counter = Counter()
+    monkeypatch.setattr(homework, 'metric_counter', counter)
+    training = homework.read_package('RUN', [15000, 1, 75])
+    first = training.show_training_info()
+    assert training.show_training_info() == first
+    assert counter == {
+        ('Running', 'get_distance'): 1,
+        ('Running', 'get_mean_speed'): 1,
+        ('Running', 'get_spent_calories'): 1,
+    }, 'Показатели тренировки должны рассчитываться один раз.'
+
+
+@pytest.mark.parametrize('input_data, attribute, value', [
+    (('RUN', [15000, 1, 75]), 'action', 9000),
+    (('RUN', [15000, 1, 75]), 'duration', 2),
+    (('WLK', [9000, 1, 75, 180]), 'weight', 90),
+    (('WLK', [9000, 1, 75, 180]), 'height', 120),
+    (('SWM', [720, 1, 80, 25, 40]), 'count_pool', 20),
+])
+def test_training_cache_invalidation(input_data, attribute, value):
+    training = homework.read_package(*input_data)
+    training.show_training_info()
+    setattr(training, attribute, value)
+    workout_type, data = input_data
+    fresh = homework.read_package(workout_type, data)
+    setattr(fresh, attribute, value)
+    assert training.show_training_info() == fresh.show_training_info(), (
+        'После изменения данных тренировки показатели '
+        'должны пересчитываться.'
+    )
+
+
+@pytest.fixture
+def workout_registry(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES',
+                        dict(homework.WORKOUT_TYPES))
+    return homework.WORKOUT_TYPES
+
+
+def test_workout_registry(workout_registry):
+    assert workout_registry == {
+        'RUN': homework.Running,
+        'WLK': homework.SportsWalking,
+        'SWM': homework.Swimming,
+    }
+    assert homework.Swimming.PACKAGE_FIELDS == (
+        'action', 'duration', 'weight', 'length_pool', 'count_pool')
+
+
+def test_register_new_workout(workout_registry):
+    class Cycling(homework.Training, code='CYC'):
+        def get_spent_calories(self):
+            return self.weight * self.duration
+
+    @homework.register_workout('ROW')
+    class Rowing(homework.Training):
+        def get_spent_calories(self):
+            return 1.0
+
+    assert isinstance(homework.read_package('CYC', [1, 2, 3]), Cycling)
+    assert isinstance(homework.read_package('ROW', [1, 2, 3]), Rowing)
+    with pytest.raises(ValueError):
+        homework.register_workout('RUN')(Rowing)
+    with pytest.raises(TypeError):
+        class Broken(homework.Training, code='BRK'):
+            def __init__(self, *args):
+                super().__init__(*args)
+
+
+def test_read_package_errors():
+    with pytest.raises(KeyError, match='Available types: RUN, WLK, SWM'):
+        homework.read_package('CYC', [1, 2, 3])
+    with pytest.raises(TypeError, match='WLK expects 4 values'):
+        homework.read_package('WLK', [1, 2, 3])
+
+
+def test_cli(tmp_path, monkeypatch):
+    packets = tmp_path / 'packets.txt'
+    packets.write_text('# packets\nSWM 720 1 80 25 40\n\nRUN,1206,12,6\n')
+    expected = [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in [('SWM', [720, 1, 80, 25, 40]), ('RUN', [1206, 12, 6])]
+    ]
+    with Capturing() as file_output:
+        assert homework.cli([str(packets)]) == 0
+    assert file_output == expected
+    with open(packets) as stdin:
+        monkeypatch.setattr(sys, 'stdin', stdin)
+        with Capturing() as stdin_output:
+            assert homework.cli(['-', '--batch']) == 0
+    assert stdin_output == expected
+    with Capturing() as demo_output:
+        assert homework.cli([]) == 0
+    assert len(demo_output) == len(homework.DEMO_PACKAGES)
+    assert homework.cli(['--unknown']) == 2
+
+
+def test_module_import_is_lightweight():
+    code = ('import sys, homework; '
+            'print(" ".join(sorted(m for m in ("numpy", "batch") '
+            'if m in sys.modules)))')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True, cwd=str(BASE_DIR))
+    assert result.stdout.strip() == '', (
+        'Импорт `homework` не должен загружать тяжёлые модули.'
+    )
+
+
+class CountingWriter:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+def test_main_batches_output():
+    packages = [('SWM', [720, 1, 80, 25, 40]), ('RUN', [1206, 12, 6]),
+                ('WLK', [9000, 1, 75, 180])] * 3
+    expected = ''.join(
+        homework.read_package(*package).show_training_info().get_message()
+        + '\n' for package in packages)
+    writer = CountingWriter()
+    trainings = [homework.read_package(*package) for package in packages[:4]]
+    homework.main(trainings + packages[4:], out=writer, batch_size=4)
+    assert ''.join(writer.writes) == expected
+    assert len(writer.writes) == 3, (
+        'Функция `main` должна выводить сообщения пачками.'
+    )
+    with Capturing() as output:
+        homework.main(iter(packages))
+    assert output == expected.splitlines()
+
+
+def test_main_prints_ready_messages_before_error():
+    packages = [('SWM', [720, 1, 80, 25, 40]), ('RUN', [1206, 12, 6]),
+                ('RUN', [15000, 0, 75])]
+    writer = CountingWriter()
+    with pytest.raises(ZeroDivisionError):
+        homework.main(packages, out=writer)
+    assert ''.join(writer.writes) == ''.join(
+        homework.read_package(*package).show_training_info().get_message()
+        + '\n' for package in packages[:2])
+
+
+@pytest.fixture
+def calorie_profiles(monkeypatch):
+    monkeypatch.setattr(homework, 'CALORIE_PROFILES',
+                        dict(homework.CALORIE_PROFILES))
+    yield homework.CALORIE_PROFILES
+    homework.use_profile('default')
+
+
+def test_calorie_formula_is_compiled_once():
+    assert homework.Running.calorie_formula is homework.calorie_kernel(
+        homework.Running)
+    assert homework.calorie_kernel(homework.Swimming, 'default') is (
+        homework.Swimming.calorie_formula)
+    with pytest.raises(KeyError, match='Available profiles: default'):
+        homework.calorie_kernel(homework.Running, 'nope')
+
+
+def test_use_profile_applies_to_new_calculations(calorie_profiles):
+    homework.register_profile('eu', SWIMMING_CALORIE_MULTIPLIER_COEFF=4)
+    assert homework.Swimming(720, 1, 80, 25, 40).get_spent_calories() == (
+        336.0)
+    homework.use_profile('eu')
+    swimming = homework.Swimming(720, 1, 80, 25, 40)
+    assert swimming.get_spent_calories() == 672.0
+    assert homework.Running(15000, 1, 75).get_spent_calories() == 699.75
+    homework.use_profile('default', homework.Swimming)
+    assert swimming.get_spent_calories() == 672.0
+    swimming.set_calorie_profile('default')
+    assert swimming.get_spent_calories() == 336.0
+    with pytest.raises(KeyError):
+        homework.use_profile('nope')
+
+
+def test_set_calorie_profile_per_training(calorie_profiles):
+    homework.register_profile('lab', RUNNING_CALORIE_DOWNGRADER_COEFF=0)
+    first = homework.Running(9000, 1, 75)
+    second = homework.Running(9000, 1, 75)
+    first.set_calorie_profile('lab')
+    assert first.get_spent_calories() == 473.85
+    assert second.get_spent_calories() == 383.85
+
+
+@pytest.mark.parametrize('name, coeffs', [
+    ('default', {}),
+    ('new', {'LEN_STEP': 1}),
+])
+def test_register_profile_errors(calorie_profiles, name, coeffs):
+    with pytest.raises(ValueError):
+        homework.register_profile(name, **coeffs)
@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+import homework
+from ingest import IngestPool
+
+
+def expected_for(action):
+    return homework.read_package('RUN', [action, 1, 75]).show_training_info()
+
+
+def test_ordered_per_device_with_many_producers():
+    results = {}
+
+    def sink(device, message):
+        results.setdefault(device, []).append(message)
+
+    with IngestPool(sink, workers=3, queue_size=8) as pool:
+        def produce(device):
+            for action in range(1, 101):
+                pool.submit(device, 'RUN', [action, 1, 75])
+
+        producers = [threading.Thread(target=produce, args=(device,))
+                     for device in range(6)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+    for device in range(6):
+        assert results[device] == [expected_for(action)
+                                   for action in range(1, 101)]
+    stats = pool.stats()
+    assert stats.submitted == stats.processed == 600
+    assert stats.queue_depth == stats.output_depth == 0
+
+
+def test_slow_sink_does_not_lose_packets_on_close():
+    received = []
+
+    def slow_sink(device, message):
+        time.sleep(0.001)
+        received.append(message)
+
+    pool = IngestPool(slow_sink, workers=2, queue_size=4, ordered=False)
+    for action in range(1, 51):
+        pool.submit('device', 'RUN', [action, 1, 75])
+    pool.close()
+    assert len(received) == 50
+    with pytest.raises(RuntimeError):
+        pool.submit('device', 'RUN', [1, 1, 75])
+
+
+def test_errors_are_reported():
+    failures = []
+    with IngestPool(lambda device, message: None, workers=1,
+                    on_error=lambda *args: failures.append(args)) as pool:
+        pool.submit('a', 'BIK', [1, 2, 3])
+        pool.submit('a', 'RUN', [1, 0, 75])
+        pool.submit('a', 'RUN', [1, 1, 75])
+    assert [failure[1] for failure in failures] == ['BIK', 'RUN']
+    assert pool.stats().errors == 2
+    assert pool.stats().processed == 1
+
+
+def test_failing_sink_and_handler_do_not_stop_pool():
+    received = []
+
+    def sink(device, message):
+        if not received:
+            received.append(None)
+            raise IOError('disk full')
+        received.append(device)
+
+    def on_error(*args):
+        raise RuntimeError('handler failed')
+
+    with IngestPool(sink, workers=2, queue_size=2,
+                    on_error=on_error) as pool:
+        pool.submit('a', 'BIK', [1, 2, 3])
+        for index in range(20):
+            pool.submit(index, 'RUN', [15000, 1, 75], timeout=5)
+    stats = pool.stats()
+    assert (stats.processed, stats.errors) == (19, 2)
+    assert len(received) == 20
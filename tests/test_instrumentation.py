@@ -0,0 +1,47 @@
+import json
+
+import homework
+import instrumentation
+import pipeline
+
+
+def test_disabled_has_no_wrappers():
+    read_package = homework.read_package
+    get_distance = homework.Training.get_distance
+    with instrumentation.instrumented():
+        assert homework.read_package is not read_package
+        assert pipeline.read_package is homework.read_package
+    assert homework.read_package is read_package
+    assert pipeline.read_package is read_package
+    assert homework.Training.get_distance is get_distance
+    assert 'get_distance' not in vars(homework.Running)
+
+
+def test_records_stages_per_workout(tmp_path):
+    with instrumentation.instrumented() as registry:
+        for package in [('RUN', [15000, 1, 75]), ('RUN', [9000, 1, 75]),
+                        ('SWM', [720, 1, 80, 25, 40])]:
+            homework.read_package(*package).show_training_info().get_message()
+    stages = {(entry['stage'], entry['workout']): entry
+              for entry in registry.snapshot()}
+    assert stages['read_package', 'Running']['count'] == 2
+    assert stages['get_spent_calories', 'Swimming']['count'] == 1
+    assert stages['get_message', 'Running']['count'] == 2
+    assert stages['get_distance', 'Running']['seconds_total'] > 0
+
+    prometheus = registry.to_prometheus()
+    assert ('homework_stage_count{stage="read_package",workout="Running"} 2'
+            in prometheus.splitlines())
+    path = tmp_path / 'metrics.json'
+    registry.dump(str(path))
+    assert json.loads(path.read_text()) == json.loads(registry.to_json())
+
+
+def test_main_output_records_formatting(capsys):
+    with instrumentation.instrumented() as registry:
+        homework.main([('RUN', [15000, 1, 75]), ('WLK', [9000, 1, 75, 180])])
+    stages = {(entry['stage'], entry['workout']): entry['count']
+              for entry in registry.snapshot()}
+    assert stages['get_message', 'Running'] == 1
+    assert stages['get_message', 'SportsWalking'] == 1
+    assert len(capsys.readouterr().out.splitlines()) == 2
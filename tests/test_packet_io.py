@@ -0,0 +1,57 @@
+import pytest
+
+import homework
+
+packet_io = pytest.importorskip('packet_io')
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+@pytest.fixture
+def packet_file(tmp_path):
+    path = str(tmp_path / 'packets.bin')
+    with packet_io.PacketWriter(path) as writer:
+        writer.write_many(PACKAGES[:2])
+    with packet_io.PacketWriter(path, append=True) as writer:
+        writer.write_many(PACKAGES[2:])
+    return path
+
+
+def test_round_trip(packet_file):
+    with packet_io.PacketReader(packet_file) as reader:
+        assert len(reader) == len(PACKAGES)
+        assert list(reader) == PACKAGES
+        records = reader.records()
+        assert records['code'].tolist() == [b'SWM', b'RUN', b'WLK', b'RUN']
+        assert records['weight'].tolist() == [80, 75, 75, 6]
+        del records
+
+
+def test_iter_batches_matches_training(packet_file):
+    messages = [None] * len(PACKAGES)
+    with packet_io.PacketReader(packet_file) as reader:
+        for _, positions, result in reader.iter_batches(chunk_size=3):
+            for position, message in zip(positions.tolist(),
+                                         result.to_messages()):
+                messages[position] = message
+    assert messages == [
+        homework.read_package(*package).show_training_info()
+        for package in PACKAGES
+    ]
+
+
+def test_rejects_bad_files(tmp_path):
+    path = tmp_path / 'bad.bin'
+    path.write_bytes(b'nope')
+    with pytest.raises(ValueError):
+        packet_io.PacketReader(str(path))
+    path.write_bytes(packet_io.MAGIC + b'\0' * 10)
+    with pytest.raises(ValueError):
+        packet_io.PacketReader(str(path))
+    with pytest.raises(TypeError):
+        packet_io.pack_package('RUN', [1, 2])
@@ -0,0 +1,62 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import homework
+import parallel
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+] * 25
+
+
+def expected():
+    return [
+        homework.read_package(*package).show_training_info()
+        for package in PACKAGES
+    ]
+
+
+def test_chunked():
+    assert [len(chunk) for chunk in parallel.chunked(range(7), 3)] == [
+        3, 3, 1]
+    with pytest.raises(ValueError):
+        list(parallel.chunked([], 0))
+
+
+def test_small_input_runs_inline(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('Process pool should not be started')
+    monkeypatch.setattr(parallel, 'ProcessPoolExecutor', fail)
+    assert parallel.run_parallel(PACKAGES, chunk_size=1000) == expected()
+
+
+def test_run_parallel_keeps_order():
+    assert parallel.run_parallel(
+        PACKAGES, chunk_size=7, max_workers=2) == expected()
+
+
+def test_run_parallel_with_executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert parallel.run_parallel(
+            iter(PACKAGES), chunk_size=9, executor=pool) == expected()
+
+
+def test_bounded_map_limits_pending_work():
+    consumed = []
+
+    def items():
+        for index in range(20):
+            consumed.append(index)
+            yield index
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = parallel.bounded_map(pool, lambda x: x * 2, items(), 3)
+        assert next(results) == 0
+        assert len(consumed) == 4
+        assert list(results) == [index * 2 for index in range(1, 20)]
+    with pytest.raises(ValueError):
+        next(parallel.bounded_map(None, str, [], 0))
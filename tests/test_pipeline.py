@@ -0,0 +1,99 @@
+import io
+import itertools
+import threading
+import time
+
+import pytest
+
+import homework
+import pipeline
+
+LINES = [
+    'SWM 720 1 80 25 40\n',
+    '# comment\n',
+    '\n',
+    'RUN,15000,1,75\n',
+    'WLK 9000 1 75 180\n',
+]
+
+
+def expected_output():
+    packages = [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+    ]
+    return ''.join(
+        homework.read_package(*package).show_training_info().get_message()
+        + '\n'
+        for package in packages
+    )
+
+
+def test_parse_package():
+    assert homework.parse_package('WLK 9000 1.5 75 180') == (
+        'WLK', [9000, 1.5, 75, 180])
+
+
+@pytest.mark.parametrize('maxsize', [None, 1, 16])
+def test_run_pipeline(maxsize):
+    sink = io.StringIO()
+    assert pipeline.run_pipeline(LINES, sink, maxsize=maxsize) == 3
+    assert sink.getvalue() == expected_output()
+
+
+def test_stream_is_lazy_on_unbounded_source():
+    source = itertools.cycle(['RUN 15000 1 75'])
+    messages = pipeline.stream(source, maxsize=2)
+    first = list(itertools.islice(messages, 5))
+    messages.close()
+    assert [message.training_type for message in first] == ['Running'] * 5
+
+
+def test_stream_propagates_errors():
+    with pytest.raises(KeyError):
+        list(pipeline.stream(['BIK 1 2 3'], maxsize=1))
+
+
+@pytest.mark.parametrize('maxsize', [None, 1])
+def test_run_pipeline_skips_bad_packets(maxsize):
+    errors = []
+    sink = io.StringIO()
+    lines = ['RUN 15000 1 75', 'RUN x 1 75', 'BIK 1 2 3', 'RUN 15000 0 75',
+             'RUN 15000 1 75']
+    written = pipeline.run_pipeline(
+        lines, sink, maxsize=maxsize,
+        on_error=lambda item, exc: errors.append((item, type(exc))))
+    assert written == 2
+    assert sink.getvalue() == 2 * (homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info().get_message() + '\n')
+    assert [kind for _, kind in errors] == [
+        ValueError, KeyError, ZeroDivisionError]
+    assert errors[0][0] == 'RUN x 1 75'
+    assert errors[1][0] == ('BIK', [1, 2, 3])
+
+
+def test_source_errors_are_not_skipped():
+    def lines():
+        yield 'RUN 15000 1 75'
+        raise OSError('connection lost')
+
+    with pytest.raises(OSError):
+        list(pipeline.stream(lines(), maxsize=1,
+                             on_error=lambda item, exc: None))
+
+
+def test_stream_close_does_not_wait_for_blocked_source():
+    release = threading.Event()
+
+    def source():
+        yield 'RUN 15000 1 75'
+        release.wait(10)
+        yield 'RUN 15000 1 75'
+
+    messages = pipeline.stream(source(), maxsize=2)
+    assert next(messages).training_type == 'Running'
+    started = time.monotonic()
+    messages.close()
+    assert time.monotonic() - started < 2
+    release.set()
@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import homework
+import replay
+
+packet_io = pytest.importorskip('packet_io')
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+] * 25
+
+
+def skewed(packages):
+    messages = replay.object_engine(homework.read_package, packages)
+    for message in messages:
+        if message.training_type == 'Running':
+            message.calories *= 1.01
+    return messages
+
+
+def test_engines_agree():
+    report = replay.replay(PACKAGES, 'object', 'batch', chunk_size=1000)
+    assert report.ok
+    assert report.packages == len(PACKAGES)
+    assert report.throughput(report.left_seconds) > 0
+
+
+def test_mismatches_reported_with_positions(monkeypatch):
+    monkeypatch.setitem(replay._engines, 'skewed', skewed)
+    report = replay.replay(PACKAGES, 'object', 'skewed', chunk_size=30,
+                           max_workers=1, max_mismatches=3)
+    assert report.mismatch_count == 50
+    assert [mismatch.position for mismatch in report.mismatches] == [
+        1, 3, 5]
+    assert report.mismatches[0].field == 'calories'
+    assert replay.replay(PACKAGES, 'object', 'skewed', rel_tol=0.02,
+                         chunk_size=1000).ok
+
+
+def test_engine_errors_are_mismatches(monkeypatch):
+    packages = [('RUN', [15000, 1, 75]), ('RUN', [15000, 0, 75])]
+    for right in ('homework', 'batch'):
+        assert replay.replay(packages, 'object', right).ok
+
+    def lenient(chunk):
+        return [homework.InfoMessage('Running', data[1], 0, 0, 0)
+                for _, data in chunk]
+
+    monkeypatch.setitem(replay._engines, 'lenient', lenient)
+    report = replay.replay(packages, 'object', 'lenient')
+    assert report.mismatch_count == 4
+    mismatch = report.mismatches[0]
+    assert (mismatch.position, mismatch.field) == (0, 'distance')
+    mismatch = report.mismatches[-1]
+    assert (mismatch.position, mismatch.field) == (1, 'error')
+    assert isinstance(mismatch.left, ZeroDivisionError)
+
+
+def test_replay_in_processes():
+    report = replay.replay(iter(PACKAGES), chunk_size=7, max_workers=2)
+    assert report.ok
+    assert report.packages == len(PACKAGES)
+
+
+@pytest.mark.parametrize('binary', [True, False])
+def test_main_reads_corpus(tmp_path, capsys, binary):
+    path = str(tmp_path / 'corpus')
+    if binary:
+        with packet_io.PacketWriter(path) as writer:
+            writer.write_many(PACKAGES)
+    else:
+        with open(path, 'w') as corpus:
+            corpus.write('# corpus\n')
+            for workout_type, data in PACKAGES:
+                corpus.write('{} {}\n'.format(
+                    workout_type, ' '.join(map(str, data))))
+    assert list(replay.read_corpus(path)) == PACKAGES
+    assert replay.main([path, '--chunk-size', '40', '--workers', '1']) == 0
+    assert 'mismatches: 0' in capsys.readouterr().out
+
+
+def test_dropped_rows_are_mismatches(monkeypatch):
+    monkeypatch.setitem(replay._engines, 'first',
+                        lambda packages: skewed(packages)[:1])
+    report = replay.replay(PACKAGES[:4], 'object', 'first')
+    assert not report.ok
+    assert [(mismatch.position, mismatch.field)
+            for mismatch in report.mismatches] == [
+        (1, 'missing'), (2, 'missing'), (3, 'missing')]
+    assert report.mismatches[0].right is replay.MISSING
+
+
+def test_replay_pulls_corpus_lazily(monkeypatch):
+    consumed = []
+    merged_at = []
+
+    def corpus():
+        for package in PACKAGES * 10:
+            consumed.append(package)
+            yield package
+
+    def merge(report, other, max_mismatches):
+        merged_at.append(len(consumed))
+
+    monkeypatch.setattr(replay.ReplayReport, 'merge', merge)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        replay.replay(corpus(), chunk_size=10, max_workers=1, executor=pool)
+    assert merged_at[0] <= 30
+    assert len(merged_at) == 100
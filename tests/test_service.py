@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+import homework
+import service
+from stats import LatencyRecorder, percentiles
+
+
+def test_percentiles():
+    assert percentiles(range(1, 101), (50, 99)) == {'p50': 50, 'p99': 99}
+    assert percentiles([], (50,)) == {'p50': 0.0}
+    recorder = LatencyRecorder()
+    recorder.add(0.002)
+    assert recorder.snapshot()['p50_ms'] == 2.0
+
+
+def test_process_line():
+    expected = homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info().get_message()
+    assert service.process_line('RUN 15000 1 75') == expected
+    assert service.process_line('BIK 1 2 3').startswith('ERROR: ')
+    assert service.process_line('RUN 1 0 75').startswith('ERROR: ')
+    assert service.process_line(
+        'RUN {} 1 75'.format('9' * 400)).startswith('ERROR: ')
+
+
+def test_server_round_trip():
+    async def scenario():
+        server = service.TrainingServer(port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(
+                server.host, server.port)
+            writer.write(b'SWM 720 1 80 25 40\nBIK 1\nRUN 15000 1 75\n'
+                         b'STATS\n')
+            await writer.drain()
+            replies = [(await reader.readline()).decode().rstrip('\n')
+                       for _ in range(4)]
+            writer.close()
+            await writer.wait_closed()
+            summary = await service.load_test(
+                server.host, server.port, connections=20, packets=5)
+        finally:
+            await server.close()
+        return replies, summary, server.stats()
+
+    replies, summary, stats = asyncio.run(scenario())
+    assert replies[0] == service.process_line('SWM 720 1 80 25 40')
+    assert replies[1].startswith('ERROR: ')
+    assert replies[2] == service.process_line('RUN 15000 1 75')
+    assert json.loads(replies[3])['count'] == 3
+    assert summary['packets'] == 100
+    assert stats['count'] == 103
+    assert stats['max_batch'] > 1
+
+
+def test_bad_lines_get_error_replies():
+    async def scenario():
+        server = service.TrainingServer(port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(
+                server.host, server.port)
+            writer.write(b'RUN 15000 1 75\n\xff\xfe\n'
+                         + b'R' * (service.LINE_LIMIT * 2) + b'\n'
+                         + b'RUN 15000 1 75\n')
+            await writer.drain()
+            replies = [(await reader.readline()).decode().rstrip('\n')
+                       for _ in range(4)]
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            await server.close()
+        return replies
+
+    replies = asyncio.run(scenario())
+    assert replies[0] == replies[3] == service.process_line('RUN 15000 1 75')
+    assert replies[1] == 'ERROR: packet is not valid UTF-8'
+    assert replies[2].startswith('ERROR: line is longer than')
+
+
+def test_bad_packet_does_not_stall_other_connections():
+    async def scenario():
+        server = service.TrainingServer(port=0)
+        await server.start()
+        try:
+            bad = await asyncio.open_connection(server.host, server.port)
+            good = await asyncio.open_connection(server.host, server.port)
+            bad[1].write('RUN {} 1 75\n'.format('9' * 400).encode())
+            good[1].write(b'WLK 9000 1 75 180\n')
+            await asyncio.gather(bad[1].drain(), good[1].drain())
+            replies = await asyncio.wait_for(asyncio.gather(
+                bad[0].readline(), good[0].readline()), 1)
+            for _, writer in (bad, good):
+                writer.close()
+                await writer.wait_closed()
+        finally:
+            await server.close()
+        return [reply.decode().rstrip('\n') for reply in replies]
+
+    bad, good = asyncio.run(scenario())
+    assert bad.startswith('ERROR: ')
+    assert good == service.process_line('WLK 9000 1 75 180')
+
+
+def test_batch_isolates_failing_line(monkeypatch):
+    def process_line(line):
+        if line == 'boom':
+            raise RuntimeError('boom')
+        return 'ok'
+
+    monkeypatch.setattr(service, 'process_line', process_line)
+
+    async def scenario():
+        batcher = service.Batcher()
+        futures = [batcher.submit(line) for line in ('ok', 'boom', 'ok')]
+        return await asyncio.wait_for(asyncio.gather(*futures), 1)
+
+    assert asyncio.run(scenario()) == ['ok', 'ERROR: boom', 'ok']
+
+
+def test_sender_drains_after_disconnect():
+    class BrokenWriter:
+        def write(self, data):
+            pass
+
+        async def drain(self):
+            raise ConnectionResetError
+
+    async def scenario():
+        replies = asyncio.Queue(maxsize=2)
+        sender = asyncio.create_task(
+            service.TrainingServer._send(replies, BrokenWriter()))
+        for _ in range(5):
+            await asyncio.wait_for(replies.put('reply'), 1)
+        await asyncio.wait_for(replies.put(None), 1)
+        await asyncio.wait_for(sender, 1)
+
+    asyncio.run(scenario())
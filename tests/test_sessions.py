@@ -0,0 +1,58 @@
+import pytest
+
+import homework
+from sessions import SampleSession
+
+
+def test_session_matches_aggregated_training():
+    session = SampleSession('RUN', weight=75)
+    for _ in range(6):
+        session.feed([2, 3] * 300)
+    assert session.action == 9000
+    assert session.duration == 1
+    assert (session.show_training_info()
+            == homework.read_package('RUN', [9000, 1, 75])
+            .show_training_info())
+
+
+def test_peak_speed():
+    session = SampleSession('WLK', weight=75, height=180, peak_window=2)
+    session.feed([1, 1, 4])
+    session.feed([2, 0])
+    expected = 6 * homework.SportsWalking.LEN_STEP / 1000 / (2 / 3600)
+    assert session.peak_speed == pytest.approx(expected)
+    assert session.samples == 5
+
+
+def test_swimming_session_uses_paddle_length():
+    session = SampleSession('SWM', weight=80, length_pool=25, count_pool=40)
+    session.feed(iter([1] * 3600))
+    info = session.show_training_info()
+    assert info.distance == pytest.approx(3600 * 1.38 / 1000)
+    assert info == homework.read_package(
+        'SWM', [3600, 1, 80, 25, 40]).show_training_info()
+
+
+def test_session_validation():
+    with pytest.raises(KeyError):
+        SampleSession('BIK', weight=70)
+    with pytest.raises(TypeError):
+        SampleSession('WLK', weight=70)
+    with pytest.raises(ValueError):
+        SampleSession('RUN', weight=70, peak_window=0)
+
+
+@pytest.mark.parametrize('workout_type, extras', [
+    ('RUN', {}),
+    ('WLK', {'height': 180}),
+    ('SWM', {'length_pool': 25, 'count_pool': 40}),
+])
+def test_session_without_samples(workout_type, extras):
+    session = SampleSession(workout_type, weight=75, **extras)
+    info = session.show_training_info()
+    assert info.training_type == homework.WORKOUT_TYPES[
+        workout_type].__name__
+    assert (info.duration, info.distance, info.speed, info.calories) == (
+        0, 0, 0, 0)
+    session.feed([])
+    assert session.show_training_info() == info
@@ -0,0 +1,108 @@
+import pytest
+
+import homework
+import shard
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+PACKETS = [
+    ('athlete-{}'.format(index % 7), *PACKAGES[index % len(PACKAGES)])
+    for index in range(200)
+]
+
+
+def expected_totals():
+    totals = {}
+    for key, workout_type, data in PACKETS:
+        message = homework.read_package(workout_type, data)
+        totals.setdefault(key, shard.Totals()).add(
+            message.show_training_info())
+    return totals
+
+
+def check_results(coordinator, results):
+    results = sorted(results, key=lambda result: result[0])
+    assert [seq for seq, _, _ in results] == list(range(len(PACKETS)))
+    for (_, key, message), (packet_key, workout_type, data) in zip(
+            results, PACKETS):
+        assert key == packet_key
+        assert message == homework.read_package(
+            workout_type, data).show_training_info()
+    assert coordinator.totals.keys() == expected_totals().keys()
+    for key, totals in expected_totals().items():
+        assert coordinator.totals[key].count == totals.count
+        assert coordinator.totals[key].calories == pytest.approx(
+            totals.calories)
+
+
+def test_process_batch_totals_and_errors():
+    results, totals, errors = shard.process_batch(
+        [(0, 'a', 'RUN', [15000, 1, 75]), (1, 'a', 'RUN', [15000, 0, 75]),
+         (2, 'b', 'BIK', [1, 2, 3])], collect=False)
+    assert results == []
+    assert totals['a'].count == 1
+    assert [(seq, key) for seq, key, *_ in errors] == [(1, 'a'), (2, 'b')]
+
+
+def test_keys_stay_on_one_worker():
+    with shard.ShardCoordinator(workers=3, batch_size=16,
+                                collect=True) as coordinator:
+        routes = {key: coordinator.route(key) for key, *_ in PACKETS}
+        coordinator.submit_many(PACKETS)
+    check_results(coordinator, coordinator.results)
+    assert len(set(routes.values())) > 1
+    assert coordinator.stats().processed == len(PACKETS)
+
+
+def test_rebalances_when_worker_dies():
+    with shard.ShardCoordinator(workers=3, batch_size=8, max_in_flight=2,
+                                collect=True) as coordinator:
+        coordinator.submit_many(PACKETS[:50])
+        victim = coordinator.route(PACKETS[0][0])
+        moved = {key for key, *_ in PACKETS
+                 if coordinator.route(key) == victim}
+        kept = {key: coordinator.route(key) for key, *_ in PACKETS
+                if key not in moved}
+        coordinator.processes[victim].kill()
+        coordinator.submit_many(PACKETS[50:])
+        results = coordinator.join()
+        assert coordinator.results == []
+        assert all(coordinator.route(key) != victim for key in moved)
+        assert {key: coordinator.route(key) for key in kept} == kept
+        stats = coordinator.stats()
+    assert (stats.workers, stats.rebalances) == (2, 1)
+    check_results(coordinator, results)
+
+
+def test_totals_only_by_default():
+    with shard.ShardCoordinator(workers=2) as coordinator:
+        coordinator.submit_many(PACKETS[:100])
+        assert coordinator.join() == []
+        coordinator.submit_many(PACKETS[100:])
+    assert coordinator.results == []
+    assert coordinator.stats().processed == len(PACKETS)
+    assert coordinator.totals.keys() == expected_totals().keys()
+
+
+def test_on_result_and_errors():
+    received = []
+    with shard.ShardCoordinator(
+            workers=2, on_result=lambda key, message: received.append(key)
+    ) as coordinator:
+        coordinator.submit_many(PACKETS)
+        coordinator.submit('bad', 'RUN', [1, 0, 1])
+    assert sorted(received) == sorted(key for key, *_ in PACKETS)
+    assert coordinator.results == []
+    assert [error[1] for error in coordinator.errors] == ['bad']
+
+
+def test_all_workers_dead():
+    coordinator = shard.ShardCoordinator(workers=1, batch_size=1)
+    coordinator.processes[0].kill()
+    with pytest.raises(RuntimeError, match='All shard workers'):
+        coordinator.submit_many(PACKETS)
+        coordinator.join()
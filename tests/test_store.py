@@ -0,0 +1,44 @@
+import pytest
+
+import homework
+from store import TrainingStore
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def test_training_keeps_data_in_slots():
+    for workout_type, data in PACKAGES:
+        training = homework.read_package(workout_type, data)
+        training.show_training_info()
+        slots = {slot for cls in type(training).__mro__
+                 for slot in getattr(cls, '__slots__', ())}
+        assert {'_action', '_duration', '_weight'} <= slots
+        assert not hasattr(training, 'calories')
+        # Ленивый `__dict__` пуст: ни данные, ни показатели в него не попали.
+        assert training.__dict__ == {}
+
+
+def test_store_rows_and_views():
+    store = TrainingStore(PACKAGES)
+    assert len(store) == 3
+    assert store.row(2) == ('WLK', [9000, 1, 75, 180])
+    for training, (workout_type, data) in zip(store, PACKAGES):
+        expected = homework.read_package(workout_type, data)
+        assert type(training) is type(expected)
+        assert (training.show_training_info()
+                == expected.show_training_info())
+
+
+def test_store_column_and_nbytes():
+    store = TrainingStore(PACKAGES)
+    assert store.column(0).tolist() == [720, 15000, 9000]
+    assert store.nbytes == 3 * (2 + 5 * 8)
+
+
+def test_store_rejects_long_package():
+    with pytest.raises(ValueError):
+        TrainingStore().append('RUN', [1, 2, 3, 4, 5, 6])
@@ -0,0 +1,80 @@
+import math
+
+import pytest
+
+import homework
+import validation
+
+
+@pytest.mark.parametrize('package, reason', [
+    (('RUN', [15000, 1, 75]), None),
+    (('SWM', [720, 1.5, 80, 25, 0]), None),
+    (('RUN', [15000, 1]), 'expected 3 values, got 2'),
+    (('RUN', None), 'data must be a sequence'),
+    (('RUN', [15000, 0, 75]), 'duration must be >= 0.001'),
+    (('WLK', [9000, 1, 75, 0]), 'height must be >= 1'),
+    (('WLK', [1e300, 1, 75, 180]), 'action must be <= 1000000'),
+    (('RUN', [15000, 1e-300, 75]), 'duration must be >= 0.001'),
+    (('SWM', [720, 1, 80, 25, 10 ** 9]), 'count_pool must be <= 100000'),
+    (('RUN', [-1, 1, 75]), 'action must be >= 0'),
+    (('RUN', ['15000', 1, 75]), 'action must be a number'),
+    (('RUN', [True, 1, 75]), 'action must be a number'),
+    (('SWM', [720, 1, float('nan'), 25, 40]), 'weight must be finite'),
+    (('BIK', [1, 2, 3]), "unknown training type 'BIK'"),
+    (('RUN', [10 ** 400, 1, 75]), 'action is out of range'),
+])
+def test_validate(package, reason):
+    assert validation.validate(*package) == reason
+
+
+def test_validate_many_and_filter():
+    packages = [('RUN', [15000, 1, 75]), ('RUN', [15000, 0, 75]),
+                ('WLK', [9000, 1, 75, 180]), ('SWM', [1, 2])]
+    mask, reasons = validation.validate_many(packages)
+    assert mask == [False, True, False, True]
+    assert reasons[0] is None and reasons[1] == 'duration must be >= 0.001'
+    assert list(validation.valid_packages(packages)) == [
+        packages[0], packages[2]]
+
+
+def test_checked_read_package():
+    assert isinstance(validation.read_package('RUN', [15000, 1, 75]),
+                      homework.Running)
+    with pytest.raises(validation.PacketValidationError,
+                       match='duration must be >= 0.001'):
+        validation.read_package('RUN', [15000, 0, 75])
+
+
+@pytest.mark.parametrize('workout_type', ['RUN', 'WLK', 'SWM'])
+def test_limits_keep_results_finite(workout_type):
+    # Худший случай: наибольшие значения при наименьших длительности и росте.
+    divisors = ('duration', 'height')
+    data = [validation.FIELD_RULES[name][name not in divisors]
+            for name in homework.WORKOUT_TYPES[workout_type].PACKAGE_FIELDS]
+    assert validation.validate(workout_type, data) is None
+    message = validation.read_package(workout_type, data).show_training_info()
+    assert all(math.isfinite(value) for value in (
+        message.distance, message.speed, message.calories))
+
+
+def test_schema_follows_registry(monkeypatch):
+    monkeypatch.setattr(homework, 'WORKOUT_TYPES',
+                        dict(homework.WORKOUT_TYPES))
+
+    class Rowing(homework.Training, code='ROW'):
+        def __init__(self, action, duration, weight, resistance):
+            super().__init__(action, duration, weight)
+            self.resistance = resistance
+
+    assert validation.validate('ROW', [100, 1, 70, -3]) is None
+    assert validation.validate('ROW', [100, 1, 70]) == (
+        'expected 4 values, got 3')
+
+
+def test_numpy_scalars_are_numbers():
+    np = pytest.importorskip('numpy')
+    assert validation.validate(
+        'WLK', [np.int64(9000), np.float64(1.5), np.int32(75),
+                np.float32(180)]) is None
+    assert validation.validate(
+        'RUN', [np.bool_(True), 1, 75]) == 'action must be a number'
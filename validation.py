@@ -0,0 +1,135 @@
+"""Проверка пакетов до расчёта.
+
+Для каждого зарегистрированного вида тренировки один раз собирается
+схема: число значений, их типы и допустимые диапазоны. Проверка пакета —
+один проход по значениям без исключений, поэтому грязный поток можно
+отфильтровать до создания объектов `Training` и до ошибок вроде
+`ZeroDivisionError` при нулевой длительности или росте и `OverflowError`
+при огромных значениях.
+"""
+from math import isfinite
+from numbers import Real
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import homework
+
+Package = Tuple[str, List[float]]
+Check = Callable[[List[float]], Optional[str]]
+
+# Границы значения поля: (минимум, максимум, строгий ли минимум).
+# Границы с запасом покрывают реальные тренировки и при этом держат
+# скорость и калории в пределах float: без нижней границы длительности
+# в 0.001 ч (3.6 с) и роста в 1 см показатели уходят в бесконечность.
+# Поля новых видов тренировок проверяются только на конечное число.
+FIELD_RULES: Dict[str, Tuple[float, float, bool]] = {
+    'action': (0, 10 ** 6, False),
+    'duration': (0.001, 1000, False),
+    'weight': (0, 1000, True),
+    'height': (1, 300, False),
+    'length_pool': (0, 1000, True),
+    'count_pool': (0, 10 ** 5, False),
+}
+_ANY_NUMBER: Tuple[float, float, bool] = (float('-inf'), float('inf'), False)
+
+
+class PacketValidationError(ValueError):
+    """Пакет не прошёл проверку схемы."""
+
+
+def _number_error(name: str, value: object) -> Optional[str]:
+    """Причина, по которой `value` не является конечным числом."""
+    # `Real` принимает и скаляры NumPy (`numpy.int64`, `numpy.float64`);
+    # `bool` — подкласс `int`, но не число.
+    if not isinstance(value, Real) or isinstance(value, bool):
+        return '{} must be a number'.format(name)
+    try:
+        finite = isfinite(value)
+    except OverflowError:
+        # Целое, которое не помещается во float.
+        return '{} is out of range'.format(name)
+    if not finite:
+        return '{} must be finite'.format(name)
+    return None
+
+
+def compile_schema(fields: Tuple[str, ...]) -> Check:
+    """Собрать функцию проверки значений пакета с полями `fields`."""
+    arity = len(fields)
+    rules = tuple(
+        (index, name) + FIELD_RULES.get(name, _ANY_NUMBER)
+        for index, name in enumerate(fields)
+    )
+
+    def check(data: List[float]) -> Optional[str]:
+        try:
+            size = len(data)
+        except TypeError:
+            return 'data must be a sequence'
+        if size != arity:
+            return 'expected {} values, got {}'.format(arity, size)
+        for index, name, minimum, maximum, strict in rules:
+            value = data[index]
+            error = _number_error(name, value)
+            if error is not None:
+                return error
+            if value < minimum or (strict and value == minimum):
+                return '{} must be {} {}'.format(
+                    name, '>' if strict else '>=', minimum)
+            if value > maximum:
+                return '{} must be <= {}'.format(name, maximum)
+        return None
+    return check
+
+
+_schemas: Dict[type, Check] = {}
+
+
+def schema_for(workout_type: str) -> Optional[Check]:
+    """Схема для кода тренировки или `None` для неизвестного кода."""
+    workout = homework.WORKOUT_TYPES.get(workout_type)
+    if workout is None:
+        return None
+    check = _schemas.get(workout)
+    if check is None:
+        check = _schemas[workout] = compile_schema(workout.PACKAGE_FIELDS)
+    return check
+
+
+def validate(workout_type: str, data: List[float]) -> Optional[str]:
+    """Вернуть причину отказа или `None`, если пакет корректен."""
+    check = schema_for(workout_type)
+    if check is None:
+        return 'unknown training type {!r}'.format(workout_type)
+    return check(data)
+
+
+def validate_many(packages: Iterable[Package]
+                  ) -> Tuple[List[bool], List[Optional[str]]]:
+    """Проверить пакеты одним проходом.
+
+    Возвращает маску плохих строк (`True` — пакет отбракован) и
+    причины отказа (`None` для корректных пакетов).
+    """
+    mask = []
+    reasons = []
+    for workout_type, data in packages:
+        reason = validate(workout_type, data)
+        mask.append(reason is not None)
+        reasons.append(reason)
+    return mask, reasons
+
+
+def valid_packages(packages: Iterable[Package]) -> Iterator[Package]:
+    """Пропустить дальше только корректные пакеты."""
+    for workout_type, data in packages:
+        if validate(workout_type, data) is None:
+            yield workout_type, data
+
+
+def read_package(workout_type: str, data: List[float]) -> homework.Training:
+    """`homework.read_package` с предварительной проверкой схемы."""
+    reason = validate(workout_type, data)
+    if reason is not None:
+        raise PacketValidationError(
+            '{} package rejected: {}'.format(workout_type, reason))
+    return homework.read_package(workout_type, data)